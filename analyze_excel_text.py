@@ -3,7 +3,9 @@ import pandas as pd
 import spacy
 import textstat
 import logging
+import argparse
 from utils import load_excel, save_to_csv
+from service.profiling_service import ProfilingService, add_profiling_arguments
 
 # Load SpaCy NLP model
 nlp = spacy.load("en_core_web_sm")
@@ -51,9 +53,12 @@ class AnalysisService:
             "passive_voice_percentage": passive_voice_percentage,
         }
 
-def main():
+def main(args):
     logging.info("Starting combined readability analysis...")
 
+    # Opt-in per-stage profiling (no-op unless --profile is given)
+    profiler = ProfilingService.from_args("analyze_excel_text", args)
+
     # Define file paths
     data_dir = "data"
     excel_path = os.path.join(data_dir, "writing_polish_rcds.xlsx")
@@ -62,8 +67,9 @@ def main():
     results_csv_path = os.path.join(results_dir, "readability_comparison_inExcel.csv")
 
     # Load Excel file
-    logging.info(f"Loading Excel file: {excel_path}")
-    df = load_excel(excel_path, sheet_name="Sheet1")
+    with profiler.stage("load_excel"):
+        logging.info(f"Loading Excel file: {excel_path}")
+        df = load_excel(excel_path, sheet_name="Sheet1")
 
     # Ensure required columns exist
     if "Original" not in df.columns or "Polished" not in df.columns:
@@ -76,44 +82,52 @@ def main():
     readability_results = []
 
     # Process each article
-    for idx, row in df.iterrows():
-        article_id = idx + 1
-        title = row.get("Title", "Unknown Title")
-        year = row.get("Year", "Unknown Year")
-        location = row.get("GRP", "Unknown").upper()
-
-        # Analyze Original Text
-        original_text = row["Original"]
-        original_readability = analysis_service.calculate_readability(original_text)
-        original_scientific = analysis_service.calculate_scientific_metrics(original_text)
-        readability_results.append({
-            "article_id": article_id,
-            "title": title,
-            "year": year,
-            "location": location,
-            "version": "original",
-            **original_readability,
-            **original_scientific
-        })
-
-        # Analyze Polished Text
-        polished_text = row["Polished"]
-        polished_readability = analysis_service.calculate_readability(polished_text)
-        polished_scientific = analysis_service.calculate_scientific_metrics(polished_text)
-        readability_results.append({
-            "article_id": article_id,
-            "title": title,
-            "year": year,
-            "location": location,
-            "version": "excel_polished",
-            **polished_readability,
-            **polished_scientific
-        })
+    with profiler.stage("analysis"):
+        for idx, row in df.iterrows():
+            article_id = idx + 1
+            title = row.get("Title", "Unknown Title")
+            year = row.get("Year", "Unknown Year")
+            location = row.get("GRP", "Unknown").upper()
+
+            # Analyze Original Text
+            original_text = row["Original"]
+            original_readability = analysis_service.calculate_readability(original_text)
+            original_scientific = analysis_service.calculate_scientific_metrics(original_text)
+            readability_results.append({
+                "article_id": article_id,
+                "title": title,
+                "year": year,
+                "location": location,
+                "version": "original",
+                **original_readability,
+                **original_scientific
+            })
+
+            # Analyze Polished Text
+            polished_text = row["Polished"]
+            polished_readability = analysis_service.calculate_readability(polished_text)
+            polished_scientific = analysis_service.calculate_scientific_metrics(polished_text)
+            readability_results.append({
+                "article_id": article_id,
+                "title": title,
+                "year": year,
+                "location": location,
+                "version": "excel_polished",
+                **polished_readability,
+                **polished_scientific
+            })
 
     # Convert results to DataFrame and save to CSV
-    results_df = pd.DataFrame(readability_results)
-    save_to_csv(results_df, results_csv_path)
-    logging.info(f"Combined readability results saved to: {results_csv_path}")
+    with profiler.stage("csv_write"):
+        results_df = pd.DataFrame(readability_results)
+        save_to_csv(results_df, results_csv_path)
+        logging.info(f"Combined readability results saved to: {results_csv_path}")
+
+    profiler.write_summary()
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Compare readability of the original and polished texts in the Excel file.")
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+
+    main(args)
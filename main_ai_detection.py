@@ -1,9 +1,16 @@
 import os
+import random
 import logging
+import argparse
 import pandas as pd
 from dotenv import load_dotenv
-from utils import load_json, save_to_json
+from utils import load_json, save_to_csv, load_article_text
 from service.analysis_service import AnalysisService
+from service.detection_service import run_detection, run_detection_with_dedup, gptzero_score, build_metadata_frame, build_results_tables
+from service.corpus_store import CorpusStore
+from service.dedup_service import MinHashIndex
+from service.sampling_service import AdaptiveSampler
+from service.profiling_service import ProfilingService, add_profiling_arguments
 
 # Set up logging
 logging.basicConfig(
@@ -12,10 +19,13 @@ logging.basicConfig(
     handlers=[logging.StreamHandler()]
 )
 
-def main():
+def main(args):
     load_dotenv() 
     logging.info("Starting AI detection analysis workflow with GPTZero and Originality.AI...")
 
+    # Opt-in per-stage profiling (no-op unless --profile is given)
+    profiler = ProfilingService.from_args("ai_detection", args)
+
     # Define paths
     data_dir = "data"
     metadata_path = os.path.join(data_dir, "metadata.json")
@@ -35,113 +45,176 @@ def main():
     logging.info("Metadata loaded successfully.")
 
     # Initialize AnalysisService
-    analysis_service = AnalysisService()
-
-    # Storage for AI detection results
-    gptzero_results_list = []
-    originality_results_list = []
-
-    # Process all articles
-    for article_id, metadata in metadata_records.items():
-        logging.info(f"Processing article {article_id} for AI detection...")
-
-        # Process each repetition, including original
-        for rep in reps:
-            # Define file paths for the text and response JSON
-            if rep == "original":
-                text_path = os.path.join(data_dir, f"article_{int(article_id):03}.txt")
-                gptzero_output_dir = os.path.join(gptzero_output_base_dir, "original")
-                originality_output_dir = os.path.join(originality_output_base_dir, "original")
-            else:
-                text_path = os.path.join(polished_articles_dir, rep, f"output_{int(article_id):03}.txt")
-                gptzero_output_dir = os.path.join(gptzero_output_base_dir, rep)
-                originality_output_dir = os.path.join(originality_output_base_dir, rep)
-
-            os.makedirs(gptzero_output_dir, exist_ok=True)
-            os.makedirs(originality_output_dir, exist_ok=True)
-
-            gptzero_save_path = os.path.join(gptzero_output_dir, f"ai_detection_{int(article_id):03}.json")
-            originality_save_path = os.path.join(originality_output_dir, f"ai_detection_{int(article_id):03}.json")
-
-            # Skip if text file does not exist
-            if not os.path.exists(text_path):
-                logging.warning(f"Text file not found for article {article_id} in {rep}. Skipping...")
-                continue
-
-            # Read the text for analysis
-            with open(text_path, "r", encoding="utf-8") as file:
-                article_text = file.read()
-
-            # Calculate letter length
-            letter_length = len(article_text.replace(" ", ""))
-
-            # GPTZero Detection
-            if not os.path.exists(gptzero_save_path):
-                logging.info(f"Running GPTZero detection for article {article_id} in {rep}...")
-                gptzero_response = analysis_service.detect_ai_text_gptzero(article_text)
-                save_to_json(gptzero_response, gptzero_save_path)
-                logging.info(f"Saved GPTZero response for article {article_id} in {rep} to {gptzero_save_path}")
-            else:
-                logging.info(f"GPTZero response exists for article {article_id} in {rep}. Skipping...")
-                gptzero_response = load_json(gptzero_save_path)
-
-            # Extract GPTZero relevant info
-            document = gptzero_response.get("documents", [{}])[0]
-            class_probabilities = document.get("class_probabilities", {})
-
-            gptzero_results_list.append({
-                "article_id": article_id,
-                "title": metadata.get("Title", "N/A"),
-                "authors": "; ".join([" ".join([part for part in author.split() if "@" not in part]).strip() for author in metadata.get("Authors", ["N/A"])]),
-                "year": metadata.get("Year", "N/A"),
-                "location": metadata.get("Location", "N/A"),
-                "version": rep,
-                "completely_generated_prob": round(document.get("completely_generated_prob", 0.0), 3),
-                "human_prob": round(class_probabilities.get("human", 0.0), 3),
-                "ai_prob": round(class_probabilities.get("ai", 0.0), 3),
-                "predicted_class": document.get("predicted_class", "N/A"),
-                "confidence_category": document.get("confidence_category", "N/A"),
-                "letter_length": letter_length
-            })
-
-            # Originality.AI Detection
-            if not os.path.exists(originality_save_path):
-                logging.info(f"Running Originality.AI detection for article {article_id} in {rep}...")
-                originality_response = analysis_service.detect_ai_text_originality(article_text)
-                save_to_json(originality_response, originality_save_path)
-                logging.info(f"Saved Originality.AI response for article {article_id} in {rep} to {originality_save_path}")
-            else:
-                logging.info(f"Originality.AI response exists for article {article_id} in {rep}. Skipping...")
-                originality_response = load_json(originality_save_path)
-
-            # Extract Originality.AI relevant info
-            ai_classification = originality_response.get("ai", {}).get("classification", {})
-            ai_confidence = originality_response.get("ai", {}).get("confidence", {})
-
-            originality_results_list.append({
-                "article_id": article_id,
-                "title": metadata.get("Title", "N/A"),
-                "authors": "; ".join([" ".join([part for part in author.split() if "@" not in part]).strip() for author in metadata.get("Authors", ["N/A"])]),
-                "year": metadata.get("Year", "N/A"),
-                "location": metadata.get("Location", "N/A"),
-                "version": rep,
-                "AI_classification": ai_classification.get("AI", "N/A"),
-                "Original_classification": ai_classification.get("Original", "N/A"),
-                "AI_confidence": ai_confidence.get("AI", "N/A"),
-                "Original_confidence": ai_confidence.get("Original", "N/A"),
-                "letter_length": letter_length
-            })
+    with profiler.stage("init_services"):
+        analysis_service = AnalysisService()
+
+    # Read texts from a packed corpus instead of per-article files if requested
+    corpus_store = CorpusStore(args.corpus_dir) if args.corpus_dir else None
+
+    # Storage for raw AI detection responses
+    detection_records = []
+
+    # Near-duplicate index used to skip redundant detector calls (opt-in)
+    dedup_index = None
+    dedup_report = []
+    rng = random.Random(args.seed)
+    if args.dedup_threshold is not None:
+        dedup_index = MinHashIndex.load(args.dedup_index) if os.path.exists(args.dedup_index) else MinHashIndex()
+        logging.info(f"Near-duplicate detection enabled (threshold={args.dedup_threshold}, {len(dedup_index)} indexed texts).")
+
+    def detect_job(article_id, rep):
+        """
+        Score one (article, version) job and store its record; returns None if the text does not exist.
+        """
+        # Load the text from the packed corpus or the text-file layout, skip if it does not exist
+        article_text = load_article_text(article_id, rep, data_dir, polished_articles_dir, corpus_store)
+        if article_text is None:
+            logging.warning(f"Text not found for article {article_id} in {rep}. Skipping...")
+            return None
+
+        # Calculate letter length
+        letter_length = len(article_text.replace(" ", ""))
+
+        reused = False
+        if dedup_index is not None:
+            (gptzero_response, originality_response), reused = run_detection_with_dedup(
+                analysis_service, dedup_index, dedup_report, article_id, rep, article_text,
+                gptzero_output_base_dir, originality_output_base_dir,
+                args.dedup_threshold, args.dedup_sample_rate, rng,
+            )
+        else:
+            gptzero_response, originality_response = run_detection(
+                analysis_service, article_id, rep, article_text,
+                gptzero_output_base_dir, originality_output_base_dir,
+            )
+        record = {
+            "article_id": article_id,
+            "version": rep,
+            "letter_length": letter_length,
+            "gptzero": gptzero_response,
+            "originality": originality_response,
+            "reused": reused,
+        }
+        detection_records.append(record)
+        return record
+
+    with profiler.stage("detection"):
+        if args.adaptive:
+            # Sample jobs per location x year x version stratum until every estimate is precise enough
+            jobs_by_stratum = {}
+            for article_id, metadata in metadata_records.items():
+                for rep in reps:
+                    stratum = (metadata.get("Location", "N/A"), metadata.get("Year", "N/A"), rep)
+                    jobs_by_stratum.setdefault(stratum, []).append((article_id, rep))
+            sampler = AdaptiveSampler(
+                jobs_by_stratum,
+                target_width=args.target_ci_width,
+                confidence=args.confidence,
+                batch_size=args.adaptive_batch_size,
+                min_samples=args.min_samples,
+                seed=args.seed,
+            )
+            logging.info(f"Adaptive sampling over {len(jobs_by_stratum)} strata "
+                         f"(target CI width={args.target_ci_width}, confidence={args.confidence}).")
+
+            batch_number = 0
+            batch = sampler.next_batch()
+            while batch:
+                batch_number += 1
+                for stratum, (article_id, rep) in batch:
+                    record = detect_job(article_id, rep)
+                    # A reused near-duplicate score is not an independent draw, so it does not count as a sample
+                    value = gptzero_score(record["gptzero"]) if record and not record["reused"] else None
+                    if value is None:
+                        sampler.discard(stratum)
+                    else:
+                        sampler.record(stratum, value)
+
+                converged = sum(sampler.is_converged(stratum) for stratum in jobs_by_stratum)
+                logging.info(f"Batch {batch_number}: {len(detection_records)} jobs scored so far, "
+                             f"{converged}/{len(jobs_by_stratum)} strata converged.")
+                batch = sampler.next_batch()
+
+            total_jobs = sum(len(jobs) for jobs in jobs_by_stratum.values())
+            logging.info(f"Adaptive sampling finished after scoring {len(detection_records)} of {total_jobs} jobs.")
+
+            # Save per-stratum estimates
+            estimates = []
+            for (location, year, rep) in jobs_by_stratum:
+                estimates.append({
+                    "location": location,
+                    "year": year,
+                    "version": rep,
+                    **sampler.estimate((location, year, rep)),
+                    "converged": sampler.is_converged((location, year, rep)),
+                })
+            adaptive_csv_path = os.path.join(results_dir, "adaptive_estimates.csv")
+            save_to_csv(pd.DataFrame(estimates), adaptive_csv_path)
+            logging.info(f"Adaptive estimates saved to {adaptive_csv_path}.")
+        else:
+            # Process all articles
+            for article_id in metadata_records.keys():
+                logging.info(f"Processing article {article_id} for AI detection...")
+
+                # Process each repetition, including original
+                for rep in reps:
+                    detect_job(article_id, rep)
+
+    if corpus_store:
+        corpus_store.close()
+
+    if dedup_index is not None:
+        dedup_index.save(args.dedup_index)
+        dedup_report_path = os.path.join(results_dir, "dedup_report.csv")
+        dedup_report_df = pd.DataFrame(dedup_report, columns=[
+            "article_id", "version", "duplicate_of", "similarity", "action",
+            "source_completely_generated_prob", "fresh_completely_generated_prob", "completely_generated_prob_diff",
+            "source_AI_classification", "fresh_AI_classification", "AI_classification_diff",
+        ])
+        save_to_csv(dedup_report_df, dedup_report_path)
+        reused = int((dedup_report_df["action"] == "reused").sum())
+        sampled = int((dedup_report_df["action"] == "sampled").sum())
+        logging.info(f"Near-duplicates: {reused} reused, {sampled} sampled for validation. "
+                     f"API calls avoided: {2 * reused}. Report saved to {dedup_report_path}.")
+        prob_diffs = pd.to_numeric(dedup_report_df["completely_generated_prob_diff"], errors="coerce").dropna()
+        if not prob_diffs.empty:
+            class_diffs = pd.to_numeric(dedup_report_df["AI_classification_diff"], errors="coerce").dropna()
+            logging.info(f"Sampled duplicates vs. their sources: mean |completely_generated_prob diff| = {prob_diffs.abs().mean():.3f}, "
+                         f"AI classification changed in {int((class_diffs != 0).sum())}/{len(class_diffs)}.")
+
+    # Assemble both results tables in bulk
+    with profiler.stage("assembly"):
+        gptzero_results_df, originality_results_df = build_results_tables(build_metadata_frame(metadata_records), detection_records)
+
+    # Adaptive runs only score a sample, so they must not overwrite the full tables
+    prefix = "adaptive_" if args.adaptive else ""
+
     # Save GPTZero results to Excel
-    gptzero_results_df = pd.DataFrame(gptzero_results_list)
-    gptzero_excel_path = os.path.join(results_dir, "gptzero_results.xlsx")
-    gptzero_results_df.to_excel(gptzero_excel_path, index=False)
-    logging.info(f"GPTZero results saved to {gptzero_excel_path}.")
+    with profiler.stage("excel_write"):
+        gptzero_excel_path = os.path.join(results_dir, f"{prefix}gptzero_results.xlsx")
+        gptzero_results_df.to_excel(gptzero_excel_path, index=False)
+        logging.info(f"GPTZero results saved to {gptzero_excel_path}.")
+
+        # Save Originality.AI results to Excel
+        originality_excel_path = os.path.join(results_dir, f"{prefix}originality_ai_results.xlsx")
+        originality_results_df.to_excel(originality_excel_path, index=False)
+        logging.info(f"Originality.AI results saved to {originality_excel_path}.")
 
-    # Save Originality.AI results to Excel
-    originality_results_df = pd.DataFrame(originality_results_list)
-    originality_excel_path = os.path.join(results_dir, "originality_ai_results.xlsx")
-    originality_results_df.to_excel(originality_excel_path, index=False)
-    logging.info(f"Originality.AI results saved to {originality_excel_path}.")
+    profiler.write_summary()
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Run AI detection on original and polished texts.")
+    parser.add_argument("--corpus-dir", type=str, default=None, help="Read texts from a packed corpus (see main_corpus_store.py)")
+    parser.add_argument("--dedup-threshold", type=float, default=None, help="Reuse detection results of near-duplicates with estimated Jaccard similarity at or above this value")
+    parser.add_argument("--dedup-index", type=str, default="outputs/minhash_index.npz", help="Path of the persistent MinHash/LSH index")
+    parser.add_argument("--dedup-sample-rate", type=float, default=0.0, help="Fraction of near-duplicates still sent to the APIs to validate reuse")
+    parser.add_argument("--adaptive", action="store_true", help="Score stratified random samples until every location x year x version estimate is precise enough")
+    parser.add_argument("--target-ci-width", type=float, default=0.1, help="Stop sampling a stratum once its confidence interval of completely_generated_prob is narrower than this")
+    parser.add_argument("--confidence", type=float, default=0.95, help="Confidence level of the adaptive-sampling intervals")
+    parser.add_argument("--adaptive-batch-size", type=int, default=5, help="Jobs drawn per stratum in each adaptive-sampling batch")
+    parser.add_argument("--min-samples", type=int, default=5, help="Minimum jobs scored per stratum before it may stop")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for sampling")
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+
+    main(args)
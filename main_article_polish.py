@@ -6,6 +6,8 @@ from dotenv import load_dotenv
 from utils import load_excel, save_to_txt, save_to_json, load_json
 from service.prompt_service import PromptService
 from service.polish_service import PolishService
+from service.chunk_service import ChunkService
+from service.profiling_service import ProfilingService, add_profiling_arguments
 from service.data_prep_service import DataPrepService
 
 # Set up logging
@@ -15,12 +17,48 @@ logging.basicConfig(
     handlers=[logging.StreamHandler()]
 )
 
+def polish_and_save(polish_service, chunk_service, args, data_dir, article_id, rep_folders):
+    """
+    Polish one cleaned article once per repetition folder and save each version there.
+
+    A single folder takes the regular single-completion path; several folders are filled
+    from one multi-completion request.
+    """
+    # Load cleaned article text
+    cleaned_file_path = os.path.join(data_dir, f"article_{article_id:03}.txt")
+    with open(cleaned_file_path, "r", encoding="utf-8") as file:
+        article_text = file.read()
+
+    # Polish the article
+    if chunk_service:
+        polished_articles = polish_service.polish_article_chunked_n(
+            article_text,
+            len(rep_folders),
+            chunk_service,
+            max_tokens=args.chunk_tokens,
+            overlap_sentences=args.chunk_overlap,
+            max_workers=args.chunk_workers,
+        )
+    else:
+        polished_articles = polish_service.polish_article_n(article_text, len(rep_folders))
+
+    # Save one polished text per repetition
+    for rep_folder, polished_article in zip(rep_folders, polished_articles):
+        polished_file_path = os.path.join(rep_folder, f"output_{article_id:03}.txt")
+        save_to_txt(polished_file_path, polished_article)
+        logging.info(f"Polished article saved successfully to {polished_file_path}.")
+
 def main(args):
     logging.info("Starting the polishing workflow...")
 
     # Log input parameters
     logging.info(f"Input Parameters: repetitions={args.repetitions}, model={args.model}, "
-                 f"temperature={args.temperature}, prompt_version={args.prompt_version}, skip_data_prep={args.skip_data_prep}")
+                 f"temperature={args.temperature}, prompt_version={args.prompt_version}, skip_data_prep={args.skip_data_prep}, "
+                 f"chunk_tokens={args.chunk_tokens}, chunk_overlap={args.chunk_overlap}, chunk_workers={args.chunk_workers}, "
+                 f"multi_completion={args.multi_completion}")
+
+    # Opt-in per-stage profiling (no-op unless --profile is given)
+    profiler = ProfilingService.from_args("article_polish", args)
 
     # Load API key
     load_dotenv()
@@ -54,6 +92,11 @@ def main(args):
     )
     logging.info("PolishService initialized.")
 
+    # Initialize ChunkService only when chunked polishing is requested
+    chunk_service = ChunkService(model=model) if args.chunk_tokens > 0 else None
+    if chunk_service:
+        logging.info(f"Chunked polishing enabled with a budget of {args.chunk_tokens} tokens per chunk.")
+
     # Define paths
     data_dir = "data"
     excel_path = f"{data_dir}/writing_polish_rcds.xlsx"
@@ -62,94 +105,96 @@ def main(args):
     os.makedirs(output_dir, exist_ok=True)
 
     # Load and clean articles if not skipping data prep
-    if not args.skip_data_prep:
-        logging.info("Data preparation step started...")
-        os.makedirs(data_dir, exist_ok=True)
-
-        logging.info(f"Loading Excel file: {excel_path}")
-        df = load_excel(excel_path, sheet_name="Sheet1")
-        logging.info(f"Loaded {len(df)} articles from the Excel file.")
-
-        # Extract relevant columns
-        articles = df["Original"].tolist()
-        Titles = df["Title"].tolist()
-        years = df["Year"].tolist()
-        grp = df["GRP"].tolist()
-        authors_raw = df.get("Authors", ["Unknown"] * len(df)).tolist()  # Default to "Unknown" if 'Authors' column is missing
-
-        # Process metadata and save cleaned texts
-        metadata_records = {}
-        data_prep_service = DataPrepService()
-        for idx, article in enumerate(articles):
-            # Extract metadata
-            Title = Titles[idx]
-            year = years[idx]
-            location = "USA" if grp[idx] == "USA" else "Asian"
-            author_list = authors_raw[idx].split(" ∙ ") if authors_raw[idx] != "Unknown" else ["Unknown"]
-
-            # Add metadata to the record
-            metadata_records[idx + 1] = {
-                "Title": Title,
-                "Year": year,
-                "Location": location,
-                "Authors": author_list
-            }
-
-            cleaned_article = data_prep_service.clean_article(article)
-
-            # Save cleaned text
-            cleaned_file_name = f"article_{idx+1:03}.txt"
-            cleaned_file_path = os.path.join(data_dir, cleaned_file_name)
+    with profiler.stage("data_prep"):
+        if not args.skip_data_prep:
+            logging.info("Data preparation step started...")
+            os.makedirs(data_dir, exist_ok=True)
+
+            logging.info(f"Loading Excel file: {excel_path}")
+            df = load_excel(excel_path, sheet_name="Sheet1")
+            logging.info(f"Loaded {len(df)} articles from the Excel file.")
+
+            # Extract relevant columns
+            articles = df["Original"].tolist()
+            Titles = df["Title"].tolist()
+            years = df["Year"].tolist()
+            grp = df["GRP"].tolist()
+            authors_raw = df.get("Authors", ["Unknown"] * len(df)).tolist()  # Default to "Unknown" if 'Authors' column is missing
+
+            # Process metadata and save cleaned texts
+            metadata_records = {}
+            data_prep_service = DataPrepService()
+            for idx, article in enumerate(articles):
+                # Extract metadata
+                Title = Titles[idx]
+                year = years[idx]
+                location = "USA" if grp[idx] == "USA" else "Asian"
+                author_list = authors_raw[idx].split(" ∙ ") if authors_raw[idx] != "Unknown" else ["Unknown"]
+
+                # Add metadata to the record
+                metadata_records[idx + 1] = {
+                    "Title": Title,
+                    "Year": year,
+                    "Location": location,
+                    "Authors": author_list
+                }
+
+                cleaned_article = data_prep_service.clean_article(article)
+
+                # Save cleaned text
+                cleaned_file_name = f"article_{idx+1:03}.txt"
+                cleaned_file_path = os.path.join(data_dir, cleaned_file_name)
+                try:
+                    save_to_txt(cleaned_file_path, cleaned_article)
+                    logging.info(f"Cleaned text saved successfully to {cleaned_file_path}.")
+                except Exception as e:
+                    logging.error(f"Error saving cleaned text to {cleaned_file_path}: {e}")
+
+            # Save metadata to JSON
             try:
-                save_to_txt(cleaned_file_path, cleaned_article)
-                logging.info(f"Cleaned text saved successfully to {cleaned_file_path}.")
+                save_to_json(metadata=metadata_records, file_path=metadata_path)
+                logging.info(f"Metadata saved successfully to {metadata_path}.")
             except Exception as e:
-                logging.error(f"Error saving cleaned text to {cleaned_file_path}: {e}")
-
-        # Save metadata to JSON
-        try:
-            save_to_json(metadata=metadata_records, file_path=metadata_path)
-            logging.info(f"Metadata saved successfully to {metadata_path}.")
-        except Exception as e:
-            logging.error(f"Error saving metadata to {metadata_path}: {e}")
-    else:
-        # Skip data prep and load metadata
-        logging.info("Skipping data preparation step. Loading pre-existing cleaned data...")
-        if not os.path.exists(metadata_path):
-            raise FileNotFoundError(f"Metadata file not found at {metadata_path}. Please run without --skip-data-prep first.")
-        metadata_records = load_json(metadata_path)
-        logging.info("Metadata loaded successfully.")
+                logging.error(f"Error saving metadata to {metadata_path}: {e}")
+        else:
+            # Skip data prep and load metadata
+            logging.info("Skipping data preparation step. Loading pre-existing cleaned data...")
+            if not os.path.exists(metadata_path):
+                raise FileNotFoundError(f"Metadata file not found at {metadata_path}. Please run without --skip-data-prep first.")
+            metadata_records = load_json(metadata_path)
+            logging.info("Metadata loaded successfully.")
 
     # Perform repetitions for polished texts
-    articles = [int(article_id) for article_id in metadata_records.keys()]
-    for rep in range(1, repetitions + 1):
-        logging.info(f"Starting repetition {rep}/{repetitions}...")
-        # Create a subfolder for this repetition
-        rep_folder = os.path.join(output_dir, f"rep{rep}")
-        os.makedirs(rep_folder, exist_ok=True)
-
-        # Process each article
-        for idx, article_id in enumerate(articles):
-            try:
-                # Generate file name for polished text
-                polished_file_name = f"output_{article_id:03}.txt"
-                polished_file_path = os.path.join(rep_folder, polished_file_name)
-
-                # Load cleaned article text
-                cleaned_file_path = os.path.join(data_dir, f"article_{article_id:03}.txt")
-                with open(cleaned_file_path, "r", encoding="utf-8") as file:
-                    article_text = file.read()
-
-                # Polish the article
-                logging.info(f"Polishing article {article_id}/{len(articles)} in repetition {rep}...")
-                polished_article = polish_service.polish_article(article_text)
-
-                # Save polished text
-                save_to_txt(polished_file_path, polished_article)
-                logging.info(f"Polished article saved successfully to {polished_file_path}.\n")
-            except Exception as e:
-                logging.error(f"Error processing article {article_id} in repetition {rep}: {e}")
-
+    with profiler.stage("polishing"):
+        articles = [int(article_id) for article_id in metadata_records.keys()]
+        if args.multi_completion and repetitions > 1:
+            # One request per article returns all repetitions, fanned out to rep1..repN
+            rep_folders = [os.path.join(output_dir, f"rep{rep}") for rep in range(1, repetitions + 1)]
+            for rep_folder in rep_folders:
+                os.makedirs(rep_folder, exist_ok=True)
+
+            for idx, article_id in enumerate(articles):
+                logging.info(f"Polishing article {article_id}/{len(articles)} for {repetitions} repetitions in one request...")
+                try:
+                    polish_and_save(polish_service, chunk_service, args, data_dir, article_id, rep_folders)
+                except Exception as e:
+                    logging.error(f"Error processing article {article_id}: {e}")
+        else:
+            for rep in range(1, repetitions + 1):
+                logging.info(f"Starting repetition {rep}/{repetitions}...")
+                # Create a subfolder for this repetition
+                rep_folder = os.path.join(output_dir, f"rep{rep}")
+                os.makedirs(rep_folder, exist_ok=True)
+
+                # Process each article
+                for idx, article_id in enumerate(articles):
+                    logging.info(f"Polishing article {article_id}/{len(articles)} in repetition {rep}...")
+                    try:
+                        polish_and_save(polish_service, chunk_service, args, data_dir, article_id, [rep_folder])
+                    except Exception as e:
+                        logging.error(f"Error processing article {article_id} in repetition {rep}: {e}")
+
+    profiler.write_summary()
     logging.info("Workflow completed.")
     logging.info(f"Polished texts saved to repetitions under: {output_dir}")
 
@@ -160,6 +205,11 @@ if __name__ == "__main__":
     parser.add_argument("--temperature", type=float, default=0.7, help="Temperature for the OpenAI API")
     parser.add_argument("--prompt_version", type=str, default="v1", help="Prompt version to use")
     parser.add_argument("--skip-data-prep", action="store_true", help="Skip the data preparation step if already done")
+    parser.add_argument("--chunk-tokens", type=int, default=0, help="Polish long articles in chunks of at most this many tokens (0 disables chunking)")
+    parser.add_argument("--chunk-overlap", type=int, default=0, help="Number of preceding sentences passed to each chunk as context")
+    parser.add_argument("--chunk-workers", type=int, default=4, help="Number of chunks polished concurrently")
+    parser.add_argument("--multi-completion", action="store_true", help="Request all repetitions of an article in one API call (n completions)")
+    add_profiling_arguments(parser)
     args = parser.parse_args()
 
     main(args)
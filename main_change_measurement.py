@@ -0,0 +1,162 @@
+import os
+import logging
+import argparse
+import itertools
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from utils import load_json, save_to_csv, load_article_text
+from service.similarity_service import SimilarityService
+from service.corpus_store import CorpusStore
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler()]
+)
+
+def measure_chunk(chunk):
+    """
+    Measure every version pair in a chunk of articles (runs in a worker process).
+
+    Args:
+        chunk (dict): `pairs` (article_id, version_a, version_b, row_a, row_b) tuples with
+                      rows local to the chunk, plus the chunk's `tfidf`/`binary` matrix rows
+                      and `token_ids`.
+
+    Returns:
+        list: One result dict per pair.
+    """
+    if not chunk["pairs"]:
+        return []
+
+    article_ids, versions_a, versions_b, rows_a, rows_b = (list(column) for column in zip(*chunk["pairs"]))
+    rows_a, rows_b = np.array(rows_a), np.array(rows_b)
+
+    # Cosine and Jaccard for all pairs of the chunk in one sparse operation each
+    cosine = SimilarityService.pairwise_cosine(chunk["tfidf"], rows_a, rows_b)
+    jaccard = SimilarityService.pairwise_jaccard(chunk["binary"], rows_a, rows_b)
+
+    token_ids = chunk["token_ids"]
+    return [
+        {
+            "article_id": article_ids[idx],
+            "version_a": versions_a[idx],
+            "version_b": versions_b[idx],
+            "edit_distance_ratio": SimilarityService.edit_distance_ratio(token_ids[rows_a[idx]], token_ids[rows_b[idx]]),
+            "jaccard_similarity": jaccard[idx],
+            "tfidf_cosine_similarity": cosine[idx],
+        }
+        for idx in range(len(article_ids))
+    ]
+
+def build_chunks(article_rows, tfidf, binary, token_ids, chunk_size):
+    """
+    Group articles into chunks and slice the matrices so each worker only receives its own rows.
+    """
+    article_items = list(article_rows.items())
+    for start in range(0, len(article_items), chunk_size):
+        chunk_items = article_items[start:start + chunk_size]
+        global_rows = [row for _, version_rows in chunk_items for _, row in version_rows]
+        local_row = {row: idx for idx, row in enumerate(global_rows)}
+
+        pairs = []
+        for article_id, version_rows in chunk_items:
+            for (version_a, row_a), (version_b, row_b) in itertools.combinations(version_rows, 2):
+                pairs.append((article_id, version_a, version_b, local_row[row_a], local_row[row_b]))
+
+        yield {
+            "pairs": pairs,
+            "tfidf": tfidf[global_rows],
+            "binary": binary[global_rows],
+            "token_ids": [token_ids[row] for row in global_rows],
+        }
+
+def main(args):
+    """
+    Quantify how much polishing changed each article and how much the repetitions differ from each other.
+    """
+    logging.info("Starting change measurement workflow...")
+
+    # Define paths
+    data_dir = "data"  # Directory for original texts
+    polished_dir = "outputs/polished_articles"  # Base directory for polished texts
+    metadata_path = os.path.join(data_dir, "metadata.json")
+    results_dir = "results"
+    os.makedirs(results_dir, exist_ok=True)
+
+    # Control which repetitions to process
+    reps = ["original", "rep1", "rep2", "rep3"]  # Control variable: includes original and reps
+
+    # Load metadata
+    try:
+        metadata_records = load_json(metadata_path)
+        logging.info("Metadata loaded successfully.")
+    except Exception as e:
+        logging.error(f"Failed to load metadata: {e}")
+        return
+
+    # Read texts from a packed corpus instead of per-article files if requested
+    corpus_store = CorpusStore(args.corpus_dir) if args.corpus_dir else None
+
+    # Read every available version; article_rows maps article_id -> [(version, corpus row)]
+    texts = []
+    article_rows = {}
+    for article_id in metadata_records.keys():
+        for rep in reps:
+            article_text = load_article_text(article_id, rep, data_dir, polished_dir, corpus_store)
+            if article_text is None:
+                logging.warning(f"Text not found for article {article_id} in {rep}. Skipping...")
+                continue
+
+            texts.append(article_text)
+            article_rows.setdefault(article_id, []).append((rep, len(texts) - 1))
+
+    if corpus_store:
+        corpus_store.close()
+
+    if not texts:
+        logging.error("No texts found to compare.")
+        return
+    logging.info(f"Loaded {len(texts)} texts for {len(article_rows)} articles.")
+
+    # IDF weights are fitted on the whole corpus so cosine similarities are comparable across articles
+    similarity_service = SimilarityService()
+    tfidf, binary, token_ids = similarity_service.fit_transform(texts)
+    logging.info(f"Encoded corpus with a vocabulary of {tfidf.shape[1]} tokens.")
+
+    results = []
+    chunks = build_chunks(article_rows, tfidf, binary, token_ids, args.chunk_size)
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        for chunk_results in executor.map(measure_chunk, chunks):
+            results.extend(chunk_results)
+    if not results:
+        logging.error("No article has more than one version to compare.")
+        return
+    logging.info(f"Measured {len(results)} version pairs.")
+
+    # Attach article metadata
+    results_df = pd.DataFrame(results)
+    metadata_df = pd.DataFrame.from_dict(metadata_records, orient="index")[["Title", "Year", "Location"]]
+    metadata_df = metadata_df.rename(columns={"Title": "title", "Year": "year", "Location": "location"})
+    results_df = results_df.join(metadata_df, on="article_id")
+    results_df = results_df[["article_id", "title", "year", "location", "version_a", "version_b",
+                             "edit_distance_ratio", "jaccard_similarity", "tfidf_cosine_similarity"]]
+
+    # Save results next to the readability results
+    change_csv_path = os.path.join(results_dir, "change_measurement_results.csv")
+    save_to_csv(results_df, change_csv_path)
+    logging.info(f"Change measurement results saved to {change_csv_path}.")
+
+    logging.info("Change measurement workflow completed successfully.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure text changes between original and polished versions.")
+    parser.add_argument("--corpus-dir", type=str, default=None, help="Read texts from a packed corpus (see main_corpus_store.py)")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes (defaults to the CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=64, help="Number of articles per worker task")
+    args = parser.parse_args()
+
+    main(args)
@@ -0,0 +1,81 @@
+import os
+import logging
+import argparse
+from utils import load_json, save_to_txt, load_article_text
+from service.corpus_store import CorpusStore
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler()]
+)
+
+def pack(args, metadata_records, data_dir, polished_dir):
+    """
+    Import the per-article text files into a packed corpus, one blob per version.
+    """
+    corpus_store = CorpusStore(args.corpus_dir)
+    for rep in args.reps:
+        documents = {}
+        for article_id in metadata_records.keys():
+            # newline="" keeps CRLF/CR line endings, so the packed bytes match the files exactly
+            article_text = load_article_text(article_id, rep, data_dir, polished_dir, newline="")
+            if article_text is None:
+                logging.warning(f"Text file not found for article {article_id} in {rep}. Skipping...")
+                continue
+            documents[article_id] = article_text
+
+        if not documents:
+            logging.warning(f"No texts found for {rep}. Nothing packed.")
+            continue
+
+        corpus_store.write_version(rep, documents)
+        logging.info(f"Packed {len(documents)} texts for {rep} into {args.corpus_dir}.")
+
+def unpack(args, data_dir, polished_dir):
+    """
+    Export a packed corpus back to the per-article text-file layout.
+    """
+    with CorpusStore(args.corpus_dir) as corpus_store:
+        for rep in args.reps:
+            article_ids = corpus_store.article_ids(rep)
+            if not article_ids:
+                logging.warning(f"Version {rep} not found in {args.corpus_dir}. Skipping...")
+                continue
+
+            rep_dir = data_dir if rep == "original" else os.path.join(polished_dir, rep)
+            os.makedirs(rep_dir, exist_ok=True)
+            for article_id in article_ids:
+                if not corpus_store.verify(rep, article_id):
+                    logging.error(f"Hash mismatch for article {article_id} in {rep}. Skipping...")
+                    continue
+                file_name = f"article_{int(article_id):03}.txt" if rep == "original" else f"output_{int(article_id):03}.txt"
+                save_to_txt(os.path.join(rep_dir, file_name), corpus_store.get_text(rep, article_id), newline="")
+            logging.info(f"Exported {len(article_ids)} texts for {rep} to {rep_dir}.")
+
+def main(args):
+    logging.info(f"Starting corpus {args.command} workflow...")
+
+    # Define paths
+    data_dir = "data"
+    polished_dir = "outputs/polished_articles"
+    metadata_path = os.path.join(data_dir, "metadata.json")
+
+    if args.command == "pack":
+        metadata_records = load_json(metadata_path)
+        logging.info("Metadata loaded successfully.")
+        pack(args, metadata_records, data_dir, polished_dir)
+    else:
+        unpack(args, data_dir, polished_dir)
+
+    logging.info(f"Corpus {args.command} workflow completed.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert between per-article text files and a packed memory-mapped corpus.")
+    parser.add_argument("command", choices=["pack", "unpack"], help="pack: text files -> corpus, unpack: corpus -> text files")
+    parser.add_argument("--corpus-dir", type=str, default="outputs/corpus", help="Directory of the packed corpus")
+    parser.add_argument("--reps", type=str, nargs="+", default=["original", "rep1", "rep2", "rep3"], help="Versions to convert")
+    args = parser.parse_args()
+
+    main(args)
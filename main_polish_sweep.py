@@ -0,0 +1,152 @@
+import os
+import json
+import openai
+import hashlib
+import logging
+import argparse
+import itertools
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dotenv import load_dotenv
+from utils import load_json, save_to_json, save_to_txt
+from service.prompt_service import PromptService
+from service.polish_service import PolishService
+from service.rate_limiter import RateLimiter
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler()]
+)
+
+def config_hash(model: str, temperature: float, template: str) -> str:
+    """
+    Identify a configuration by what is actually sent to the API, so prompt versions
+    with identical templates share one hash (and one set of outputs).
+    """
+    key = json.dumps({"model": model, "temperature": temperature, "template": template}, sort_keys=True)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:12]
+
+def build_configs(prompt_service, models, temperatures, prompt_versions):
+    """
+    Expand the model x temperature x prompt_version grid into unique configurations keyed by hash.
+    """
+    configs = {}
+    for model, temperature, prompt_version in itertools.product(models, temperatures, prompt_versions):
+        template = prompt_service.get_template(prompt_version)
+        digest = config_hash(model, temperature, template)
+        if digest in configs:
+            configs[digest]["prompt_versions"].append(prompt_version)
+            logging.info(f"Prompt version '{prompt_version}' duplicates config {digest} for model={model}, temperature={temperature}.")
+            continue
+        configs[digest] = {
+            "model": model,
+            "temperature": temperature,
+            "prompt_versions": [prompt_version],
+            "prompt_template": template,
+        }
+    return configs
+
+def polish_job(polish_service, article_text, polished_file_path, article_id, rep, digest):
+    logging.info(f"Polishing article {article_id} in {rep} for config {digest}...")
+    polished_article = polish_service.polish_article(article_text)
+    save_to_txt(polished_file_path, polished_article)
+    logging.info(f"Polished article saved successfully to {polished_file_path}.")
+
+def main(args):
+    logging.info("Starting the polishing parameter sweep...")
+    logging.info(f"Input Parameters: models={args.models}, temperatures={args.temperatures}, "
+                 f"prompt_versions={args.prompt_versions}, repetitions={args.repetitions}, "
+                 f"workers={args.workers}, requests_per_minute={args.requests_per_minute}")
+
+    # Load API key
+    load_dotenv()
+    api_key = os.getenv('API_KEY')
+
+    if not api_key:
+        raise ValueError("API key not found. Please set API_KEY in your .env file.")
+
+    client = openai.Client(api_key=api_key)
+    prompt_service = PromptService()
+    rate_limiter = RateLimiter(args.requests_per_minute)
+
+    # Define paths
+    data_dir = "data"
+    metadata_path = os.path.join(data_dir, "metadata.json")
+    sweep_dir = "outputs/sweeps"
+    manifest_path = os.path.join(sweep_dir, "manifest.json")
+    os.makedirs(sweep_dir, exist_ok=True)
+
+    if not os.path.exists(metadata_path):
+        raise FileNotFoundError(f"Metadata file not found at {metadata_path}. Please run main_article_polish.py first.")
+    metadata_records = load_json(metadata_path)
+
+    # Read each cleaned article once for all configurations
+    articles = {}
+    for article_id in metadata_records.keys():
+        cleaned_file_path = os.path.join(data_dir, f"article_{int(article_id):03}.txt")
+        try:
+            with open(cleaned_file_path, "r", encoding="utf-8") as file:
+                articles[int(article_id)] = file.read()
+        except Exception as e:
+            logging.error(f"Error reading article {article_id} from {cleaned_file_path}: {e}. Skipping...")
+    logging.info(f"Loaded {len(articles)} cleaned articles.")
+
+    configs = build_configs(prompt_service, args.models, args.temperatures, args.prompt_versions)
+    logging.info(f"Sweep expands to {len(configs)} unique configurations.")
+
+    # The manifest maps every output directory back to its exact model, temperature and template
+    manifest = load_json(manifest_path) if os.path.exists(manifest_path) else {}
+    for digest, config in configs.items():
+        config_dir = os.path.join(sweep_dir, digest)
+        entry = manifest.setdefault(digest, {**config, "output_dir": config_dir})
+        entry["prompt_versions"] = sorted(set(entry["prompt_versions"]) | set(config["prompt_versions"]))
+    save_to_json(manifest, manifest_path)
+    logging.info(f"Sweep manifest saved to {manifest_path}.")
+
+    # Schedule every (config, rep, article) job on one shared pool under the global rate limit
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        futures = {}
+        for digest, config in configs.items():
+            polish_service = PolishService(
+                client=client,
+                prompt_service=prompt_service,
+                prompt_version=config["prompt_versions"][0],
+                model=config["model"],
+                temperature=config["temperature"],
+                rate_limiter=rate_limiter,
+            )
+            for rep in range(1, args.repetitions + 1):
+                rep_folder = os.path.join(sweep_dir, digest, f"rep{rep}")
+                os.makedirs(rep_folder, exist_ok=True)
+                for article_id, article_text in articles.items():
+                    polished_file_path = os.path.join(rep_folder, f"output_{article_id:03}.txt")
+                    if os.path.exists(polished_file_path):
+                        continue
+                    future = executor.submit(
+                        polish_job, polish_service, article_text, polished_file_path, article_id, f"rep{rep}", digest,
+                    )
+                    futures[future] = (digest, article_id, rep)
+
+        logging.info(f"Scheduled {len(futures)} polishing jobs.")
+        for future in as_completed(futures):
+            digest, article_id, rep = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                logging.error(f"Error processing article {article_id} in repetition {rep} for config {digest}: {e}")
+
+    logging.info("Sweep completed.")
+    logging.info(f"Polished texts saved per configuration under: {sweep_dir}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Polish articles over a grid of model, temperature and prompt version.")
+    parser.add_argument("--models", type=str, nargs="+", default=["chatgpt-4o-latest"], help="OpenAI models to sweep")
+    parser.add_argument("--temperatures", type=float, nargs="+", default=[0.7], help="Temperatures to sweep")
+    parser.add_argument("--prompt_versions", type=str, nargs="+", default=["v1"], help="Prompt versions to sweep")
+    parser.add_argument("--repetitions", type=int, default=1, help="Number of repetitions per configuration")
+    parser.add_argument("--workers", type=int, default=8, help="Number of concurrent requests across all configurations")
+    parser.add_argument("--requests-per-minute", type=float, default=60, help="Global request rate limit shared by all workers")
+    args = parser.parse_args()
+
+    main(args)
@@ -1,8 +1,11 @@
 import os
 import logging
+import argparse
 import pandas as pd
-from utils import load_json, save_to_json, save_to_csv
+from utils import load_json, save_to_json, save_to_csv, load_article_text
 from service.analysis_service import AnalysisService
+from service.corpus_store import CorpusStore
+from service.profiling_service import ProfilingService, add_profiling_arguments
 
 # Setup logging
 logging.basicConfig(
@@ -11,12 +14,15 @@ logging.basicConfig(
     handlers=[logging.StreamHandler()]
 )
 
-def main():
+def main(args):
     """
     Perform readability assessments on original and polished texts.
     """
     logging.info("Starting readability assessment workflow...")
 
+    # Opt-in per-stage profiling (no-op unless --profile is given)
+    profiler = ProfilingService.from_args("readability_assessment", args)
+
     # Define paths
     data_dir = "data"  # Directory for original texts
     polished_dir = "outputs/polished_articles"  # Base directory for polished texts
@@ -36,59 +42,52 @@ def main():
         return
 
     # Initialize AnalysisService
-    analysis_service = AnalysisService()
+    with profiler.stage("init_services"):
+        analysis_service = AnalysisService()
+
+    # Read texts from a packed corpus instead of per-article files if requested
+    corpus_store = CorpusStore(args.corpus_dir) if args.corpus_dir else None
 
     # Storage for readability results
     readability_results = []
 
     # Process each article for original and polished repetitions
-    for article_id, metadata in metadata_records.items():
-        logging.info(f"Processing article {article_id}...")
-
-        for rep in reps:
-            # Set file path depending on rep (original vs polished)
-            if rep == "original":
-                text_path = os.path.join(data_dir, f"article_{int(article_id):03}.txt")
-            else:
-                text_path = os.path.join(polished_dir, rep, f"output_{int(article_id):03}.txt")
-
-            if not os.path.exists(text_path):
-                logging.warning(f"Text file not found for article {article_id} in {rep}. Skipping...")
-                continue
-
-            try:
-                # Read the text
-                with open(text_path, "r", encoding="utf-8") as file:
-                    article_text = file.read()
-
-                # Analyze readability
-                readability_metrics = analysis_service.calculate_readability(article_text)
-                scientific_metrics = analysis_service.calculate_scientific_metrics(article_text)
-
-                # Combine results
-                result_entry = {
-                    "article_id": article_id,
-                    "title": metadata.get("Title", "N/A"),
-                    "year": metadata.get("Year", "N/A"),
-                    "location": metadata.get("Location", "N/A"),
-                    "version": rep,
-                    **readability_metrics,
-                    **scientific_metrics,
-                }
-
-                readability_results.append(result_entry)
-
-            except Exception as e:
-                logging.error(f"Error processing article {article_id} in {rep}: {e}")
-                continue
+    with profiler.stage("assessment"):
+        for article_id, metadata in metadata_records.items():
+            logging.info(f"Processing article {article_id}...")
+
+            for rep in reps:
+                try:
+                    # Load the text from the packed corpus or the text-file layout
+                    article_text = load_article_text(article_id, rep, data_dir, polished_dir, corpus_store)
+                    if article_text is None:
+                        logging.warning(f"Text not found for article {article_id} in {rep}. Skipping...")
+                        continue
+
+                    # Analyze readability
+                    readability_results.append(analysis_service.assess_text(article_id, metadata, rep, article_text))
+
+                except Exception as e:
+                    logging.error(f"Error processing article {article_id} in {rep}: {e}")
+                    continue
+
+    if corpus_store:
+        corpus_store.close()
 
     # Save results to CSV
-    readability_csv_path = os.path.join(results_dir, "readability_results.csv")
-    save_to_csv(pd.DataFrame(readability_results), readability_csv_path)
-    logging.info(f"Readability results saved to {readability_csv_path}.")
+    with profiler.stage("csv_write"):
+        readability_csv_path = os.path.join(results_dir, "readability_results.csv")
+        save_to_csv(pd.DataFrame(readability_results), readability_csv_path)
+        logging.info(f"Readability results saved to {readability_csv_path}.")
 
+    profiler.write_summary()
     logging.info("Readability assessment workflow completed successfully.")
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Assess readability of original and polished texts.")
+    parser.add_argument("--corpus-dir", type=str, default=None, help="Read texts from a packed corpus (see main_corpus_store.py)")
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+
+    main(args)
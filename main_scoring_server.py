@@ -0,0 +1,160 @@
+import json
+import logging
+import argparse
+from concurrent.futures import wait
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from dotenv import load_dotenv
+from service.analysis_service import AnalysisService
+from service.batching_service import MicroBatcher
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler()]
+)
+
+class ScoringRequestHandler(BaseHTTPRequestHandler):
+    """
+    JSON endpoints around a shared AnalysisService.
+
+    POST bodies are {"text": "..."} or {"texts": ["...", ...]}; responses mirror the shape
+    ({"result": {...}} or {"results": [...]}).
+        POST /readability          Traditional readability metrics (textstat).
+        POST /scientific           Scientific clarity metrics (spaCy, micro-batched).
+        POST /score                Both of the above.
+        POST /detect/gptzero       GPTZero detection (proxied, one request per text).
+        POST /detect/originality   Originality.AI detection (proxied, one request per text).
+        GET  /health               Liveness check.
+    """
+
+    # Set on the class by `main` before the server starts
+    analysis_service = None
+    scientific_batcher = None
+    request_timeout = 60.0
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"error": f"Unknown endpoint: {self.path}"})
+
+    def do_POST(self):
+        handlers = {
+            "/readability": self._score_readability,
+            "/scientific": self._score_scientific,
+            "/score": self._score_all,
+            "/detect/gptzero": self._detect_gptzero,
+            "/detect/originality": self._detect_originality,
+        }
+        handler = handlers.get(self.path)
+        if handler is None:
+            self._send_json(404, {"error": f"Unknown endpoint: {self.path}"})
+            return
+
+        try:
+            texts, single = self._read_texts()
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+
+        try:
+            results = handler(texts)
+        except Exception as e:
+            logging.error(f"Error scoring request to {self.path}: {e}")
+            self._send_json(500, {"error": str(e)})
+            return
+
+        self._send_json(200, {"result": results[0]} if single else {"results": results})
+
+    def _read_texts(self):
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except (ValueError, json.JSONDecodeError):
+            raise ValueError("Request body must be valid JSON.")
+
+        if not isinstance(body, dict):
+            raise ValueError("Request body must be a JSON object.")
+        if "text" in body:
+            texts, single = [body["text"]], True
+        elif "texts" in body and isinstance(body["texts"], list):
+            texts, single = body["texts"], False
+        else:
+            raise ValueError("Request body must contain 'text' or a list of 'texts'.")
+
+        if not all(isinstance(text, str) and text.strip() for text in texts):
+            raise ValueError("Every text must be a non-empty string.")
+        return texts, single
+
+    def _score_readability(self, texts):
+        return [self.analysis_service.calculate_readability(text) for text in texts]
+
+    def _score_scientific(self, texts):
+        # Each text joins the shared queue, so texts from concurrent requests are parsed together
+        futures = [self.scientific_batcher.submit(text) for text in texts]
+        wait(futures, timeout=self.request_timeout)
+        return [future.result(timeout=0) for future in futures]
+
+    def _score_all(self, texts):
+        scientific = self._score_scientific(texts)
+        readability = self._score_readability(texts)
+        return [{**r, **s} for r, s in zip(readability, scientific)]
+
+    def _detect_gptzero(self, texts):
+        return [self.analysis_service.detect_ai_text_gptzero(text) for text in texts]
+
+    def _detect_originality(self, texts):
+        return [self.analysis_service.detect_ai_text_originality(text) for text in texts]
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logging.debug(f"{self.address_string()} - {format % args}")
+
+def main(args):
+    load_dotenv()
+    logging.info("Starting the local scoring server...")
+    logging.info(f"Input Parameters: host={args.host}, port={args.port}, "
+                 f"max_batch_size={args.max_batch_size}, max_wait_ms={args.max_wait_ms}")
+
+    # Load spaCy once for the lifetime of the server
+    analysis_service = AnalysisService()
+    scientific_batcher = MicroBatcher(
+        lambda texts: analysis_service.calculate_scientific_metrics_batch(texts, batch_size=args.max_batch_size),
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+    )
+    logging.info("AnalysisService initialized.")
+
+    ScoringRequestHandler.analysis_service = analysis_service
+    ScoringRequestHandler.scientific_batcher = scientific_batcher
+    ScoringRequestHandler.request_timeout = args.request_timeout
+
+    server = ThreadingHTTPServer((args.host, args.port), ScoringRequestHandler)
+    server.daemon_threads = True
+    logging.info(f"Scoring server listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logging.info("Shutting down the scoring server...")
+    finally:
+        server.server_close()
+        scientific_batcher.stop()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve readability, scientific and detection scores over local HTTP.")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Host interface to bind")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument("--max-batch-size", type=int, default=32, help="Maximum number of texts parsed together by spaCy")
+    parser.add_argument("--max-wait-ms", type=float, default=10.0, help="Maximum time a text waits for its micro-batch to fill")
+    parser.add_argument("--request-timeout", type=float, default=60.0, help="Seconds to wait for a batch result before failing a request")
+    args = parser.parse_args()
+
+    main(args)
@@ -0,0 +1,268 @@
+import os
+import queue
+import openai
+import logging
+import argparse
+import threading
+import pandas as pd
+from dotenv import load_dotenv
+from utils import load_json, save_to_txt, save_to_csv
+from service.prompt_service import PromptService
+from service.polish_service import PolishService
+from service.chunk_service import ChunkService
+from service.analysis_service import AnalysisService
+from service.detection_service import run_detection, build_metadata_frame, build_results_tables
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler()]
+)
+
+# Marker put on a consumer queue to tell one worker to stop
+_STOP = None
+
+def polish_worker(jobs, consumer_queues, polish_service, chunk_service, args, data_dir, output_dir):
+    """
+    Take (article_id, rep) jobs, produce the text for each and push it onto every consumer queue.
+    """
+    while True:
+        try:
+            article_id, rep = jobs.get_nowait()
+        except queue.Empty:
+            return
+
+        try:
+            cleaned_file_path = os.path.join(data_dir, f"article_{article_id:03}.txt")
+            with open(cleaned_file_path, "r", encoding="utf-8") as file:
+                article_text = file.read()
+
+            if rep != "original":
+                polished_file_path = os.path.join(output_dir, rep, f"output_{article_id:03}.txt")
+                if os.path.exists(polished_file_path):
+                    logging.info(f"Polished text exists for article {article_id} in {rep}. Reusing...")
+                    with open(polished_file_path, "r", encoding="utf-8") as file:
+                        article_text = file.read()
+                else:
+                    logging.info(f"Polishing article {article_id} in {rep}...")
+                    if chunk_service:
+                        article_text = polish_service.polish_article_chunked(
+                            article_text,
+                            chunk_service,
+                            max_tokens=args.chunk_tokens,
+                            overlap_sentences=args.chunk_overlap,
+                            max_workers=args.chunk_workers,
+                        )
+                    else:
+                        article_text = polish_service.polish_article(article_text)
+                    save_to_txt(polished_file_path, article_text)
+                    logging.info(f"Polished article saved successfully to {polished_file_path}.")
+
+            # put() blocks while a queue is full, which throttles polishing to the slowest consumer
+            for consumer_queue in consumer_queues:
+                consumer_queue.put((article_id, rep, article_text))
+        except Exception as e:
+            logging.error(f"Error producing article {article_id} in {rep}: {e}")
+
+def detection_worker(detection_queue, analysis_service, results, gptzero_output_base_dir, originality_output_base_dir):
+    """
+    Consume texts from the detection queue and run both AI detectors on them.
+    """
+    while True:
+        item = detection_queue.get()
+        if item is _STOP:
+            return
+
+        article_id, rep, article_text = item
+        try:
+            gptzero_response, originality_response = run_detection(
+                analysis_service, article_id, rep, article_text,
+                gptzero_output_base_dir, originality_output_base_dir,
+            )
+            results["detection"].append({
+                "article_id": str(article_id),
+                "version": rep,
+                "letter_length": len(article_text.replace(" ", "")),
+                "gptzero": gptzero_response,
+                "originality": originality_response,
+            })
+        except Exception as e:
+            logging.error(f"Error running AI detection for article {article_id} in {rep}: {e}")
+
+def readability_worker(readability_queue, metadata_records, results):
+    """
+    Consume texts from the readability queue and compute readability metrics for them.
+    """
+    # spaCy pipelines are not safe to share between threads, so every worker loads its own
+    try:
+        analysis_service = AnalysisService()
+    except Exception as e:
+        # Keep draining the queue so the producers are not blocked forever
+        logging.error(f"Error initializing AnalysisService for {threading.current_thread().name}: {e}")
+        analysis_service = None
+
+    while True:
+        item = readability_queue.get()
+        if item is _STOP:
+            return
+
+        article_id, rep, article_text = item
+        if analysis_service is None:
+            logging.error(f"Skipping readability for article {article_id} in {rep}: AnalysisService is unavailable.")
+            continue
+        try:
+            metadata = metadata_records[str(article_id)]
+            results["readability"].append(analysis_service.assess_text(str(article_id), metadata, rep, article_text))
+        except Exception as e:
+            logging.error(f"Error assessing readability for article {article_id} in {rep}: {e}")
+
+def start_workers(count, target, name, worker_args):
+    workers = [
+        threading.Thread(target=target, args=worker_args, name=f"{name}-{idx + 1}", daemon=True)
+        for idx in range(count)
+    ]
+    for worker in workers:
+        worker.start()
+    return workers
+
+def main(args):
+    logging.info("Starting the streaming polish -> detection/readability workflow...")
+    logging.info(f"Input Parameters: repetitions={args.repetitions}, model={args.model}, "
+                 f"temperature={args.temperature}, prompt_version={args.prompt_version}, "
+                 f"polish_workers={args.polish_workers}, detection_workers={args.detection_workers}, "
+                 f"readability_workers={args.readability_workers}, queue_size={args.queue_size}, "
+                 f"skip_detection={args.skip_detection}, skip_readability={args.skip_readability}")
+
+    # With no consumers a bounded queue is never drained and the producers block forever
+    if args.detection_workers < 1 and not args.skip_detection:
+        raise ValueError("--detection-workers must be at least 1 unless --skip-detection is set.")
+    if args.readability_workers < 1 and not args.skip_readability:
+        raise ValueError("--readability-workers must be at least 1 unless --skip-readability is set.")
+
+    # Load API key
+    load_dotenv()
+    api_key = os.getenv('API_KEY')
+
+    if not api_key:
+        raise ValueError("API key not found. Please set API_KEY in your .env file.")
+
+    # Initialize services
+    client = openai.Client(api_key=api_key)
+    prompt_service = PromptService()
+    polish_service = PolishService(
+        client=client,
+        prompt_service=prompt_service,
+        prompt_version=args.prompt_version,
+        model=args.model,
+        temperature=args.temperature,
+    )
+    chunk_service = ChunkService(model=args.model) if args.chunk_tokens > 0 else None
+    # Readability workers load their own AnalysisService; this one only serves the detection workers
+    analysis_service = None if args.skip_detection else AnalysisService()
+    logging.info("Services initialized.")
+
+    # Define paths
+    data_dir = "data"
+    metadata_path = os.path.join(data_dir, "metadata.json")
+    output_dir = "outputs/polished_articles"
+    gptzero_output_base_dir = "outputs/gptzero_responses"
+    originality_output_base_dir = "outputs/originalityai_responses"
+    results_dir = "results"
+    os.makedirs(results_dir, exist_ok=True)
+    for rep in range(1, args.repetitions + 1):
+        os.makedirs(os.path.join(output_dir, f"rep{rep}"), exist_ok=True)
+
+    # Cleaned texts and metadata come from main_article_polish.py
+    if not os.path.exists(metadata_path):
+        raise FileNotFoundError(f"Metadata file not found at {metadata_path}. Please run main_article_polish.py first.")
+    metadata_records = load_json(metadata_path)
+    logging.info("Metadata loaded successfully.")
+
+    # Originals need no polishing, so they are queued first and reach the consumers immediately
+    jobs = queue.Queue()
+    article_ids = [int(article_id) for article_id in metadata_records.keys()]
+    for rep in ["original"] + [f"rep{rep}" for rep in range(1, args.repetitions + 1)]:
+        for article_id in article_ids:
+            jobs.put((article_id, rep))
+
+    # Bounded queues between the producer and each consumer stage
+    detection_queue = queue.Queue(maxsize=args.queue_size)
+    readability_queue = queue.Queue(maxsize=args.queue_size)
+    consumer_queues = []
+    if not args.skip_detection:
+        consumer_queues.append(detection_queue)
+    if not args.skip_readability:
+        consumer_queues.append(readability_queue)
+
+    # list.append is atomic, so workers can share these result lists without a lock
+    results = {"detection": [], "readability": []}
+
+    detection_workers = [] if args.skip_detection else start_workers(
+        args.detection_workers, detection_worker, "detection",
+        (detection_queue, analysis_service, results, gptzero_output_base_dir, originality_output_base_dir),
+    )
+    readability_workers = [] if args.skip_readability else start_workers(
+        args.readability_workers, readability_worker, "readability",
+        (readability_queue, metadata_records, results),
+    )
+    polish_workers = start_workers(
+        args.polish_workers, polish_worker, "polish",
+        (jobs, consumer_queues, polish_service, chunk_service, args, data_dir, output_dir),
+    )
+
+    # Once every text is produced, tell each consumer to stop after draining its queue
+    for worker in polish_workers:
+        worker.join()
+    logging.info("All texts produced. Waiting for consumers to drain their queues...")
+    for _ in detection_workers:
+        detection_queue.put(_STOP)
+    for _ in readability_workers:
+        readability_queue.put(_STOP)
+    for worker in detection_workers + readability_workers:
+        worker.join()
+
+    # Save results next to, not over, the batch workflows' tables, which cover every repetition
+    if not args.skip_detection:
+        gptzero_results_df, originality_results_df = build_results_tables(
+            build_metadata_frame(metadata_records), sort_records(results["detection"]),
+        )
+        gptzero_excel_path = os.path.join(results_dir, "streaming_gptzero_results.xlsx")
+        gptzero_results_df.to_excel(gptzero_excel_path, index=False)
+        logging.info(f"GPTZero results saved to {gptzero_excel_path}.")
+
+        originality_excel_path = os.path.join(results_dir, "streaming_originality_ai_results.xlsx")
+        originality_results_df.to_excel(originality_excel_path, index=False)
+        logging.info(f"Originality.AI results saved to {originality_excel_path}.")
+
+    if not args.skip_readability:
+        readability_csv_path = os.path.join(results_dir, "streaming_readability_results.csv")
+        save_to_csv(pd.DataFrame(sort_records(results["readability"])), readability_csv_path)
+        logging.info(f"Readability results saved to {readability_csv_path}.")
+
+    logging.info("Streaming workflow completed.")
+
+def sort_records(records):
+    """
+    Restore the batch workflows' row order (numeric article id, original before reps).
+    """
+    return sorted(records, key=lambda record: (int(record["article_id"]), record["version"] != "original", record["version"]))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Polish articles and stream each text into AI detection and readability assessment.")
+    parser.add_argument("--repetitions", type=int, default=1, help="Number of repetitions for polishing")
+    parser.add_argument("--model", type=str, default="chatgpt-4o-latest", help="OpenAI model to use")
+    parser.add_argument("--temperature", type=float, default=0.7, help="Temperature for the OpenAI API")
+    parser.add_argument("--prompt_version", type=str, default="v1", help="Prompt version to use")
+    parser.add_argument("--chunk-tokens", type=int, default=0, help="Polish long articles in chunks of at most this many tokens (0 disables chunking)")
+    parser.add_argument("--chunk-overlap", type=int, default=0, help="Number of preceding sentences passed to each chunk as context")
+    parser.add_argument("--chunk-workers", type=int, default=4, help="Number of chunks polished concurrently")
+    parser.add_argument("--polish-workers", type=int, default=4, help="Number of concurrent polishing workers")
+    parser.add_argument("--detection-workers", type=int, default=4, help="Number of concurrent AI detection workers")
+    parser.add_argument("--readability-workers", type=int, default=1, help="Number of concurrent readability workers (each loads its own spaCy model)")
+    parser.add_argument("--queue-size", type=int, default=16, help="Maximum number of texts waiting in each consumer queue")
+    parser.add_argument("--skip-detection", action="store_true", help="Do not stream texts into AI detection")
+    parser.add_argument("--skip-readability", action="store_true", help="Do not stream texts into readability assessment")
+    args = parser.parse_args()
+
+    main(args)
@@ -1,7 +1,9 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
+import argparse
 from utils import save_plot, load_csv
+from service.profiling_service import ProfilingService, add_profiling_arguments
 
 # ------------------------------
 # General Plot Variables
@@ -125,11 +127,22 @@ def plot_ai_score_by_location_and_reps(df, output_dir):
     save_plot("fig2", output_dir)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Plot AI detection results.")
+    add_profiling_arguments(parser)
+    args = parser.parse_args()
+
+    # Opt-in per-stage profiling (no-op unless --profile is given)
+    profiler = ProfilingService.from_args("plot_results", args)
+
     results_csv_path = "results/ai_detection_results.csv"
     plots_output_dir = "plots"
 
-    ai_results_df = load_csv(results_csv_path)
-    plot_ai_score_by_year_and_location(ai_results_df, plots_output_dir)
-    plot_ai_score_by_location_and_reps(ai_results_df, plots_output_dir)
+    with profiler.stage("load_csv"):
+        ai_results_df = load_csv(results_csv_path)
+    with profiler.stage("fig1"):
+        plot_ai_score_by_year_and_location(ai_results_df, plots_output_dir)
+    with profiler.stage("fig2"):
+        plot_ai_score_by_location_and_reps(ai_results_df, plots_output_dir)
 
+    profiler.write_summary()
     print("All AI Detection boxplots have been generated and saved.")
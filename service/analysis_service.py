@@ -85,7 +85,35 @@ class AnalysisService:
         """
         Calculate advanced metrics for professional clarity in scientific texts.
         """
-        doc = self.nlp(text)
+        return self._scientific_metrics_from_doc(text, self.nlp(text))
+
+    def calculate_scientific_metrics_batch(self, texts: list, batch_size: int = 32) -> list:
+        """
+        Calculate scientific metrics for many texts, parsing them together with `nlp.pipe`.
+        """
+        return [
+            self._scientific_metrics_from_doc(text, doc)
+            for text, doc in zip(texts, self.nlp.pipe(texts, batch_size=batch_size))
+        ]
+
+    def assess_text(self, article_id: str, metadata: dict, rep: str, text: str) -> dict:
+        """
+        Calculate readability and scientific metrics for one text and combine them with its metadata.
+        """
+        readability_metrics = self.calculate_readability(text)
+        scientific_metrics = self.calculate_scientific_metrics(text)
+
+        return {
+            "article_id": article_id,
+            "title": metadata.get("Title", "N/A"),
+            "year": metadata.get("Year", "N/A"),
+            "location": metadata.get("Location", "N/A"),
+            "version": rep,
+            **readability_metrics,
+            **scientific_metrics,
+        }
+
+    def _scientific_metrics_from_doc(self, text: str, doc) -> dict:
         sentence_lengths = [len(sent.text.split()) for sent in doc.sents]
         avg_sentence_length = sum(sentence_lengths) / len(sentence_lengths) if sentence_lengths else 0
         total_words = len(text.split())
@@ -106,4 +134,3 @@ class AnalysisService:
             "lexical_density": lexical_density,
             "passive_voice_percentage": passive_voice_percentage,
         }
-
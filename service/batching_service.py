@@ -0,0 +1,79 @@
+import time
+import queue
+import threading
+from concurrent.futures import Future
+
+
+class MicroBatcher:
+    """
+    Service to coalesce concurrent single-item requests into micro-batches.
+
+    Items submitted from any thread are collected by one worker thread, which flushes a
+    batch to `process_batch` once it holds `max_batch_size` items or the oldest item has
+    waited `max_wait_ms`, whichever comes first.
+    """
+
+    def __init__(self, process_batch, max_batch_size: int = 32, max_wait_ms: float = 10.0):
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, item) -> Future:
+        """
+        Queue one item and return a Future that resolves to its result.
+        """
+        if self._stopped.is_set():
+            raise RuntimeError("MicroBatcher has been stopped.")
+        future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def _collect_batch(self) -> list:
+        # Block for the first item, then fill the batch until it is full or the wait budget is spent
+        try:
+            batch = [self._queue.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not (self._stopped.is_set() and self._queue.empty()):
+            batch = self._collect_batch()
+            if not batch:
+                continue
+
+            items = [item for item, _ in batch]
+            try:
+                results = self.process_batch(items)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            results = list(results)
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+            # Fail items left without a result instead of leaving their callers waiting until they time out
+            if len(results) < len(batch):
+                error = RuntimeError(f"process_batch returned {len(results)} results for {len(batch)} items.")
+                for _, future in batch[len(results):]:
+                    future.set_exception(error)
+
+    def stop(self) -> None:
+        """
+        Stop accepting items, finish the queued ones and join the worker thread.
+        """
+        self._stopped.set()
+        self._thread.join()
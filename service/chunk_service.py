@@ -0,0 +1,96 @@
+import re
+import tiktoken
+
+
+class ChunkService:
+    """
+    Service to split long articles into token-budgeted chunks on sentence/paragraph boundaries.
+    """
+
+    def __init__(self, model: str = "chatgpt-4o-latest"):
+        try:
+            self.encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            # Unknown or aliased model names fall back to the GPT-4o tokenizer
+            self.encoding = tiktoken.get_encoding("o200k_base")
+
+    def count_tokens(self, text: str) -> int:
+        """
+        Count the tokens of a text with the local tokenizer.
+        """
+        return len(self.encoding.encode(text))
+
+    @staticmethod
+    def split_sentences(paragraph: str) -> list:
+        """
+        Split a paragraph into sentences on terminal punctuation followed by whitespace.
+        """
+        return [sentence for sentence in re.split(r'(?<=[.!?])\s+', paragraph.strip()) if sentence]
+
+    def split_into_chunks(self, article: str, max_tokens: int) -> list:
+        """
+        Split an article into chunks of at most `max_tokens` tokens.
+
+        Paragraphs are kept whole where they fit; paragraphs longer than the budget
+        are split on sentence boundaries. A single sentence longer than the budget
+        becomes its own chunk.
+
+        Args:
+            article (str): The article text to split.
+            max_tokens (int): Token budget per chunk.
+
+        Returns:
+            list: (chunk_text, separator) tuples in document order, where `separator`
+                  is the whitespace that followed the chunk in the original layout.
+        """
+        if max_tokens <= 0:
+            raise ValueError("max_tokens must be a positive integer.")
+
+        # Regex Explanation:
+        # - \n\s*\n: Matches a blank line, i.e. a paragraph boundary.
+        paragraphs = [p.strip() for p in re.split(r'\n\s*\n', article) if p.strip()]
+
+        # Flatten into (unit, separator) pairs: whole paragraphs or sentences of long paragraphs
+        units = []
+        for paragraph in paragraphs:
+            if self.count_tokens(paragraph) <= max_tokens:
+                units.append((paragraph, "\n\n"))
+                continue
+            sentences = self.split_sentences(paragraph)
+            for idx, sentence in enumerate(sentences):
+                units.append((sentence, "\n\n" if idx == len(sentences) - 1 else " "))
+
+        # Greedily pack units into chunks under the budget
+        chunks = []
+        current_text, current_tokens = "", 0
+        for unit, separator in units:
+            unit_tokens = self.count_tokens(unit)
+            if current_text and current_tokens + unit_tokens > max_tokens:
+                chunks.append((current_text, current_separator))
+                current_text, current_tokens = "", 0
+            current_text = f"{current_text}{current_separator}{unit}" if current_text else unit
+            current_tokens += unit_tokens
+            current_separator = separator
+        if current_text:
+            chunks.append((current_text, current_separator))
+
+        return chunks
+
+    def tail_context(self, text: str, num_sentences: int) -> str:
+        """
+        Return the last `num_sentences` sentences of a text, used as overlapping context.
+        """
+        if num_sentences <= 0:
+            return ""
+        return " ".join(self.split_sentences(text)[-num_sentences:])
+
+    @staticmethod
+    def join_chunks(chunk_texts: list, separators: list) -> str:
+        """
+        Reassemble polished chunks in order using the original separators.
+        """
+        parts = []
+        for text, separator in zip(chunk_texts, separators):
+            parts.append(text.strip())
+            parts.append(separator)
+        return "".join(parts[:-1]) if parts else ""
@@ -0,0 +1,138 @@
+import os
+import mmap
+import json
+import hashlib
+
+
+class CorpusStore:
+    """
+    Packed, memory-mapped corpus: one UTF-8 blob per version plus an offset/length/hash index.
+
+    Layout under `corpus_dir`:
+        <version>.bin         Concatenated UTF-8 documents.
+        <version>.index.json  {article_id: {"offset": int, "length": int, "sha256": str}}
+    """
+
+    def __init__(self, corpus_dir: str):
+        self.corpus_dir = corpus_dir
+        self._indexes = {}
+        self._files = {}
+        self._maps = {}
+
+    def _blob_path(self, version: str) -> str:
+        return os.path.join(self.corpus_dir, f"{version}.bin")
+
+    def _index_path(self, version: str) -> str:
+        return os.path.join(self.corpus_dir, f"{version}.index.json")
+
+    def write_version(self, version: str, documents: dict) -> None:
+        """
+        Pack the documents of one version into its blob and index, replacing any previous pack.
+
+        Args:
+            version (str): Version name, e.g. "original" or "rep1".
+            documents (dict): Mapping of article_id to document text.
+        """
+        os.makedirs(self.corpus_dir, exist_ok=True)
+        self._close_version(version)
+
+        index = {}
+        offset = 0
+        blob_tmp_path = f"{self._blob_path(version)}.tmp"
+        with open(blob_tmp_path, "wb") as blob:
+            for article_id, text in documents.items():
+                data = text.encode("utf-8")
+                blob.write(data)
+                index[str(article_id)] = {
+                    "offset": offset,
+                    "length": len(data),
+                    "sha256": hashlib.sha256(data).hexdigest(),
+                }
+                offset += len(data)
+
+        index_tmp_path = f"{self._index_path(version)}.tmp"
+        with open(index_tmp_path, "w", encoding="utf-8") as file:
+            json.dump(index, file, indent=4)
+
+        # Swap both files in only once they are complete
+        os.replace(blob_tmp_path, self._blob_path(version))
+        os.replace(index_tmp_path, self._index_path(version))
+
+    def versions(self) -> list:
+        if not os.path.isdir(self.corpus_dir):
+            return []
+        suffix = ".index.json"
+        return sorted(name[:-len(suffix)] for name in os.listdir(self.corpus_dir) if name.endswith(suffix))
+
+    def _open_version(self, version: str) -> dict:
+        if version in self._indexes:
+            return self._indexes[version]
+
+        index_path = self._index_path(version)
+        if not os.path.exists(index_path):
+            self._indexes[version] = {}
+            return self._indexes[version]
+
+        with open(index_path, "r", encoding="utf-8") as file:
+            self._indexes[version] = json.load(file)
+
+        # Read-only shared mapping: every process that maps the blob reuses the same page-cache pages
+        blob = open(self._blob_path(version), "rb")
+        self._files[version] = blob
+        if os.fstat(blob.fileno()).st_size > 0:
+            self._maps[version] = mmap.mmap(blob.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._maps[version] = b""
+        return self._indexes[version]
+
+    def _close_version(self, version: str) -> None:
+        self._indexes.pop(version, None)
+        mapped = self._maps.pop(version, None)
+        if isinstance(mapped, mmap.mmap):
+            try:
+                mapped.close()
+            except BufferError:
+                # Views from get_bytes are still alive; the mapping is released once the last one is dropped
+                pass
+        blob = self._files.pop(version, None)
+        if blob:
+            blob.close()
+
+    def article_ids(self, version: str) -> list:
+        return list(self._open_version(version).keys())
+
+    def has(self, version: str, article_id) -> bool:
+        return str(article_id) in self._open_version(version)
+
+    def get_bytes(self, version: str, article_id) -> memoryview:
+        """
+        Return the UTF-8 bytes of a document as a zero-copy view into the mapped blob.
+
+        The view keeps the mapping alive: after `close` or `write_version` the store no longer
+        tracks it, and it is unmapped only when the last view is released. Use `get_text` to
+        hold on to a document without pinning the blob.
+        """
+        entry = self._open_version(version).get(str(article_id))
+        if entry is None:
+            raise KeyError(f"Article {article_id} not found in corpus version '{version}'.")
+        return memoryview(self._maps[version])[entry["offset"]:entry["offset"] + entry["length"]]
+
+    def get_text(self, version: str, article_id) -> str:
+        return str(self.get_bytes(version, article_id), "utf-8")
+
+    def verify(self, version: str, article_id) -> bool:
+        """
+        Check a document against the hash recorded in the index.
+        """
+        entry = self._open_version(version)[str(article_id)]
+        return hashlib.sha256(self.get_bytes(version, article_id)).hexdigest() == entry["sha256"]
+
+    def close(self) -> None:
+        for version in list(self._indexes.keys()):
+            self._close_version(version)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,132 @@
+import os
+import re
+import zlib
+import numpy as np
+
+
+class MinHashIndex:
+    """
+    Near-duplicate index over word shingles using MinHash signatures and LSH banding.
+
+    Each document is reduced to `num_perm` MinHash values; the signature is cut into
+    `bands` bands of `num_perm // bands` rows, and documents sharing any band bucket
+    become candidates. Candidates are confirmed by the fraction of equal signature
+    values, an estimate of the Jaccard similarity of their shingle sets.
+    """
+
+    # Mersenne prime 2^61 - 1 for the universal hash family (a * x + b) mod p
+    _PRIME = np.uint64((1 << 61) - 1)
+    _MAX_HASH = np.uint64((1 << 32) - 1)
+
+    def __init__(self, num_perm: int = 128, bands: int = 32, shingle_size: int = 5, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands.")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.seed = seed
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, np.iinfo(np.int64).max, size=num_perm, dtype=np.int64).astype(np.uint64) % self._PRIME
+        self._b = rng.randint(0, np.iinfo(np.int64).max, size=num_perm, dtype=np.int64).astype(np.uint64) % self._PRIME
+
+        self.keys = []
+        self.signatures = []
+        self._key_rows = {}
+        self._buckets = [{} for _ in range(bands)]
+
+    def shingles(self, text: str) -> np.ndarray:
+        """
+        Hash the word k-grams of a lowercased text to unique 32-bit values.
+        """
+        words = re.findall(r"\w+", text.lower())
+        if len(words) < self.shingle_size:
+            grams = [" ".join(words)]
+        else:
+            grams = [" ".join(words[i:i + self.shingle_size]) for i in range(len(words) - self.shingle_size + 1)]
+        return np.unique(np.fromiter((zlib.crc32(gram.encode("utf-8")) for gram in grams), dtype=np.uint64))
+
+    def signature(self, text: str) -> np.ndarray:
+        """
+        Compute the MinHash signature of a text (all permutations in one broadcast).
+        """
+        shingles = self.shingles(text)
+        # uint64 arithmetic wraps on overflow, as in standard MinHash implementations
+        with np.errstate(over="ignore"):
+            hashed = (np.outer(self._a, shingles) + self._b[:, None]) % self._PRIME & self._MAX_HASH
+        return hashed.min(axis=1)
+
+    def _band_keys(self, signature: np.ndarray) -> list:
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._key_rows
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, key: str, text: str = None, signature: np.ndarray = None) -> None:
+        """
+        Add a document by text or precomputed signature. Re-adding a key replaces its signature,
+        so an edited text is not matched by its stale content.
+        """
+        if signature is None:
+            signature = self.signature(text)
+
+        if key in self._key_rows:
+            row = self._key_rows[key]
+            for band, band_key in enumerate(self._band_keys(self.signatures[row])):
+                bucket = self._buckets[band][band_key]
+                bucket.remove(row)
+                if not bucket:
+                    del self._buckets[band][band_key]
+            self.signatures[row] = signature
+        else:
+            row = len(self.keys)
+            self.keys.append(key)
+            self._key_rows[key] = row
+            self.signatures.append(signature)
+        for band, band_key in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(band_key, []).append(row)
+
+    def query(self, threshold: float, text: str = None, signature: np.ndarray = None):
+        """
+        Find the most similar indexed document whose estimated Jaccard similarity is at least `threshold`.
+
+        Returns:
+            tuple: (key, similarity), or (None, 0.0) if there is no such document.
+        """
+        if signature is None:
+            signature = self.signature(text)
+
+        candidates = set()
+        for band, band_key in enumerate(self._band_keys(signature)):
+            candidates.update(self._buckets[band].get(band_key, []))
+        if not candidates:
+            return None, 0.0
+
+        rows = sorted(candidates)
+        similarities = (np.stack([self.signatures[row] for row in rows]) == signature).mean(axis=1)
+        best = int(np.argmax(similarities))
+        if similarities[best] < threshold:
+            return None, 0.0
+        return self.keys[rows[best]], float(similarities[best])
+
+    def save(self, file_path: str) -> None:
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        np.savez(
+            file_path,
+            keys=np.array(self.keys, dtype=str),
+            signatures=np.stack(self.signatures) if self.signatures else np.empty((0, self.num_perm), dtype=np.uint64),
+            params=np.array([self.num_perm, self.bands, self.shingle_size, self.seed]),
+        )
+
+    @classmethod
+    def load(cls, file_path: str) -> "MinHashIndex":
+        with np.load(file_path) as data:
+            num_perm, bands, shingle_size, seed = (int(value) for value in data["params"])
+            index = cls(num_perm=num_perm, bands=bands, shingle_size=shingle_size, seed=seed)
+            for key, signature in zip(data["keys"].tolist(), data["signatures"]):
+                index.add(key, signature=signature)
+        return index
@@ -0,0 +1,222 @@
+import os
+import logging
+import pandas as pd
+from utils import load_json, save_to_json
+
+
+# Helpers shared by the batch (main_ai_detection.py) and streaming (main_streaming_pipeline.py)
+# detection workflows: per-text detection with saved-response reuse and results-table assembly.
+
+def response_paths(article_id, rep, gptzero_output_base_dir, originality_output_base_dir):
+    """
+    Return the GPTZero and Originality.AI response JSON paths for one text.
+    """
+    return (
+        os.path.join(gptzero_output_base_dir, rep, f"ai_detection_{int(article_id):03}.json"),
+        os.path.join(originality_output_base_dir, rep, f"ai_detection_{int(article_id):03}.json"),
+    )
+
+
+def load_saved_responses(article_id, rep, gptzero_output_base_dir, originality_output_base_dir):
+    """
+    Return the saved (gptzero, originality) responses for one text, or None unless both exist without errors.
+    """
+    gptzero_save_path, originality_save_path = response_paths(article_id, rep, gptzero_output_base_dir, originality_output_base_dir)
+    if not (os.path.exists(gptzero_save_path) and os.path.exists(originality_save_path)):
+        return None
+    responses = load_json(gptzero_save_path), load_json(originality_save_path)
+    if any("error" in response for response in responses):
+        return None
+    return responses
+
+
+def run_detection(analysis_service, article_id, rep, article_text, gptzero_output_base_dir, originality_output_base_dir):
+    """
+    Run GPTZero and Originality.AI detection for one text, reusing saved responses when present.
+    """
+    gptzero_save_path, originality_save_path = response_paths(article_id, rep, gptzero_output_base_dir, originality_output_base_dir)
+    os.makedirs(os.path.dirname(gptzero_save_path), exist_ok=True)
+    os.makedirs(os.path.dirname(originality_save_path), exist_ok=True)
+
+    # GPTZero Detection
+    if not os.path.exists(gptzero_save_path):
+        logging.info(f"Running GPTZero detection for article {article_id} in {rep}...")
+        gptzero_response = analysis_service.detect_ai_text_gptzero(article_text)
+        save_to_json(gptzero_response, gptzero_save_path)
+        logging.info(f"Saved GPTZero response for article {article_id} in {rep} to {gptzero_save_path}")
+    else:
+        logging.info(f"GPTZero response exists for article {article_id} in {rep}. Skipping...")
+        gptzero_response = load_json(gptzero_save_path)
+
+    # Originality.AI Detection
+    if not os.path.exists(originality_save_path):
+        logging.info(f"Running Originality.AI detection for article {article_id} in {rep}...")
+        originality_response = analysis_service.detect_ai_text_originality(article_text)
+        save_to_json(originality_response, originality_save_path)
+        logging.info(f"Saved Originality.AI response for article {article_id} in {rep} to {originality_save_path}")
+    else:
+        logging.info(f"Originality.AI response exists for article {article_id} in {rep}. Skipping...")
+        originality_response = load_json(originality_save_path)
+
+    return gptzero_response, originality_response
+
+
+def run_detection_with_dedup(analysis_service, dedup_index, dedup_report, article_id, rep, article_text,
+                             gptzero_output_base_dir, originality_output_base_dir, threshold, sample_rate, rng):
+    """
+    Run detection for one text unless a near-duplicate has already been scored, in which case
+    its responses are reused. A `sample_rate` fraction of near-duplicates is still sent to the
+    APIs to validate the reuse. Scored texts are added to the index.
+
+    Returns:
+        tuple: ((gptzero_response, originality_response), reused) where `reused` tells
+               whether the responses were copied from a near-duplicate.
+    """
+    key = f"{int(article_id)}/{rep}"
+    signature = dedup_index.signature(article_text)
+
+    responses = None
+    source_responses = None
+    report_entry = None
+    if load_saved_responses(article_id, rep, gptzero_output_base_dir, originality_output_base_dir) is None:
+        match_key, similarity = dedup_index.query(threshold, signature=signature)
+        if match_key is not None and match_key != key:
+            match_article_id, match_rep = match_key.split("/")
+            source_responses = load_saved_responses(match_article_id, match_rep, gptzero_output_base_dir, originality_output_base_dir)
+            if rng.random() < sample_rate:
+                action = "sampled"
+            else:
+                responses = source_responses
+                action = "reused" if responses else "missing_source"
+            report_entry = {
+                "article_id": article_id,
+                "version": rep,
+                "duplicate_of": match_key,
+                "similarity": round(similarity, 3),
+                "action": action,
+            }
+            dedup_report.append(report_entry)
+            if responses:
+                logging.info(f"Article {article_id} in {rep} is a near-duplicate of {match_key} ({similarity:.2f}). Reusing its detection results...")
+
+    if responses is None:
+        responses = run_detection(
+            analysis_service, article_id, rep, article_text,
+            gptzero_output_base_dir, originality_output_base_dir,
+        )
+        # Only texts with their own successful responses can serve as a source for reuse
+        if not any("error" in response for response in responses):
+            dedup_index.add(key, signature=signature)
+
+        # Validate the reuse: compare the fresh scores of a sampled duplicate with those of its source
+        if report_entry is not None and report_entry["action"] == "sampled" and source_responses:
+            report_entry.update(compare_detections(source_responses, responses))
+        return responses, False
+
+    return responses, True
+
+
+def compare_detections(source_responses, fresh_responses):
+    """
+    Compare the scores of a near-duplicate's source with the duplicate's own fresh scores.
+    """
+    source_prob, fresh_prob = gptzero_score(source_responses[0]), gptzero_score(fresh_responses[0])
+    source_class, fresh_class = ai_classification(source_responses[1]), ai_classification(fresh_responses[1])
+    return {
+        "source_completely_generated_prob": source_prob,
+        "fresh_completely_generated_prob": fresh_prob,
+        "completely_generated_prob_diff": None if None in (source_prob, fresh_prob) else round(fresh_prob - source_prob, 3),
+        "source_AI_classification": source_class,
+        "fresh_AI_classification": fresh_class,
+        "AI_classification_diff": None if None in (source_class, fresh_class) else fresh_class - source_class,
+    }
+
+
+def gptzero_score(gptzero_response):
+    """
+    Return the GPTZero completely_generated_prob of a response, or None if it is missing.
+    """
+    if "error" in gptzero_response:
+        return None
+    return (gptzero_response.get("documents") or [{}])[0].get("completely_generated_prob")
+
+
+def ai_classification(originality_response):
+    """
+    Return the Originality.AI AI classification of a response, or None if it is missing.
+    """
+    if "error" in originality_response:
+        return None
+    return originality_response.get("ai", {}).get("classification", {}).get("AI")
+
+
+def build_metadata_frame(metadata_records):
+    """
+    Normalize article metadata once into a DataFrame indexed by article_id.
+    """
+    # object dtype keeps integer years from being upcast to float when some articles lack one
+    metadata_df = pd.DataFrame(list(metadata_records.values()), index=list(metadata_records.keys()), dtype=object)
+    metadata_df.index.name = "article_id"
+    for column in ["Title", "Year", "Location", "Authors"]:
+        if column not in metadata_df.columns:
+            metadata_df[column] = pd.NA
+
+    # Clean author names: drop e-mail tokens, collapse whitespace, join authors with "; "
+    # (missing authors become "N/A"; an empty list explodes to NaN and joins to "")
+    authors = metadata_df["Authors"].map(lambda value: value if isinstance(value, list) else ["N/A"])
+    authors = authors.explode().fillna("")
+    authors = authors.astype(str).str.replace(r"\S*@\S*", "", regex=True).str.split().str.join(" ")
+    metadata_df["authors"] = authors.groupby(level=0).agg("; ".join)
+
+    metadata_df = metadata_df.rename(columns={"Title": "title", "Year": "year", "Location": "location"})
+    metadata_df[["title", "year", "location"]] = metadata_df[["title", "year", "location"]].fillna("N/A")
+    return metadata_df[["title", "authors", "year", "location"]]
+
+
+def build_results_tables(metadata_df, detection_records):
+    """
+    Assemble the GPTZero and Originality.AI results tables from raw detector responses.
+
+    Args:
+        metadata_df (pd.DataFrame): Output of `build_metadata_frame`.
+        detection_records (list): Dicts with `article_id`, `version`, `letter_length`,
+                                  `gptzero` and `originality` (raw API responses).
+
+    Returns:
+        tuple: (gptzero_results_df, originality_results_df)
+    """
+    records_df = pd.DataFrame(detection_records, columns=["article_id", "version", "letter_length", "gptzero", "originality"])
+    keys_df = records_df[["article_id", "version", "letter_length"]].join(metadata_df, on="article_id")
+
+    # GPTZero: flatten the first scored document of every response in one pass
+    gptzero_documents = [(response.get("documents") or [{}])[0] for response in records_df["gptzero"]]
+    gptzero_df = pd.json_normalize(gptzero_documents, max_level=1).reindex(columns=[
+        "completely_generated_prob", "class_probabilities.human", "class_probabilities.ai",
+        "predicted_class", "confidence_category",
+    ])
+    gptzero_df = gptzero_df.rename(columns={"class_probabilities.human": "human_prob", "class_probabilities.ai": "ai_prob"})
+    probability_columns = ["completely_generated_prob", "human_prob", "ai_prob"]
+    gptzero_df[probability_columns] = gptzero_df[probability_columns].astype(float).fillna(0.0).round(3)
+    gptzero_df[["predicted_class", "confidence_category"]] = gptzero_df[["predicted_class", "confidence_category"]].fillna("N/A")
+
+    # Originality.AI: flatten the nested classification/confidence fields
+    originality_df = pd.json_normalize(list(records_df["originality"]), max_level=2).reindex(columns=[
+        "ai.classification.AI", "ai.classification.Original", "ai.confidence.AI", "ai.confidence.Original",
+    ])
+    originality_df.columns = ["AI_classification", "Original_classification", "AI_confidence", "Original_confidence"]
+    # Missing rows make json_normalize upcast the integer classifications to float; keep them as integers
+    classification_columns = ["AI_classification", "Original_classification"]
+    originality_df[classification_columns] = originality_df[classification_columns].astype("Int64")
+    originality_df = originality_df.astype(object).fillna("N/A")
+
+    # Both tables share the (article_id, version) keys and metadata columns
+    gptzero_results_df = pd.concat([keys_df, gptzero_df], axis=1)
+    originality_results_df = pd.concat([keys_df, originality_df], axis=1)
+
+    gptzero_columns = ["article_id", "title", "authors", "year", "location", "version",
+                       "completely_generated_prob", "human_prob", "ai_prob",
+                       "predicted_class", "confidence_category", "letter_length"]
+    originality_columns = ["article_id", "title", "authors", "year", "location", "version",
+                           "AI_classification", "Original_classification",
+                           "AI_confidence", "Original_confidence", "letter_length"]
+    return gptzero_results_df[gptzero_columns], originality_results_df[originality_columns]
@@ -1,30 +1,41 @@
+import re
+import openai
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+
 class PolishService:
     """
     Service to handle polishing a single article using the OpenAI API.
     """
 
-    def __init__(self, client, prompt_service, prompt_version: str, model: str = "chatgpt-4o-latest", temperature: float = 0.7):
+    def __init__(self, client, prompt_service, prompt_version: str, model: str = "chatgpt-4o-latest", temperature: float = 0.7, rate_limiter=None):
         self.client = client
         self.prompt_service = prompt_service
         self.prompt_version = prompt_version
         self.model = model
         self.temperature = temperature
+        self.rate_limiter = rate_limiter
+        # Set to False once the model rejects multi-completion requests, so later calls go straight to the fallback
+        self.supports_n = True
 
-    def polish_article(self, article: str) -> str:
-        if not article:
-            raise ValueError("The article text is empty and cannot be polished.")
+    def _create(self, prompt: str, n: int = 1):
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
 
-        # Get the formatted prompt from the PromptService
-        prompt = self.prompt_service.get_prompt(self.prompt_version, article)
+        kwargs = {"n": n} if n > 1 else {}
+        return self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "user", "content": prompt},
+            ],
+            temperature=self.temperature,
+            **kwargs,
+        )
 
+    def _complete(self, prompt: str) -> str:
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=self.temperature,
-            )
+            response = self._create(prompt)
 
             # Extract the polished text from the response
             polished_text = response.choices[0].message.content
@@ -32,3 +43,107 @@ class PolishService:
 
         except Exception as e:
             raise ValueError(f"OpenAI API call failed: {e}")
+
+    def _complete_n(self, prompt: str, n: int) -> list:
+        """
+        Request `n` completions of one prompt in a single call, falling back to separate
+        calls when the model does not support the `n` parameter or returns fewer choices.
+        Other request errors are raised and leave multi-completion enabled for later calls.
+        """
+        if n == 1:
+            return [self._complete(prompt)]
+
+        completions = []
+        if self.supports_n:
+            try:
+                response = self._create(prompt, n=n)
+                completions = [choice.message.content for choice in response.choices][:n]
+            except openai.BadRequestError as e:
+                if not self._rejects_n(e):
+                    raise ValueError(f"OpenAI API call failed: {e}")
+                logging.warning(f"Model {self.model} does not support multi-completion requests (n={n}), falling back to separate calls: {e}")
+                self.supports_n = False
+            except Exception as e:
+                # Transient failures (rate limits, timeouts, server errors) fail this article only
+                raise ValueError(f"OpenAI API call failed: {e}")
+
+        # Top up with single completions for anything the multi-completion call did not return
+        while len(completions) < n:
+            completions.append(self._complete(prompt))
+        return completions
+
+    @staticmethod
+    def _rejects_n(error) -> bool:
+        """
+        Whether a bad-request error is the model rejecting the `n` parameter.
+        """
+        param = getattr(error, "param", None)
+        if param is not None:
+            return param == "n"
+        # Without a param, only accept messages that name `n` as a quoted parameter, e.g. "Unsupported value: 'n'"
+        return re.search(r"['\"`]n['\"`]", str(error)) is not None
+
+    def polish_article(self, article: str) -> str:
+        if not article:
+            raise ValueError("The article text is empty and cannot be polished.")
+
+        # Get the formatted prompt from the PromptService
+        prompt = self.prompt_service.get_prompt(self.prompt_version, article)
+        return self._complete(prompt)
+
+    def polish_article_n(self, article: str, n: int) -> list:
+        """
+        Polish an article `n` times with a single multi-completion request.
+
+        Returns:
+            list: `n` independently sampled polished texts.
+        """
+        if not article:
+            raise ValueError("The article text is empty and cannot be polished.")
+
+        prompt = self.prompt_service.get_prompt(self.prompt_version, article)
+        return self._complete_n(prompt, n)
+
+    def polish_article_chunked(self, article: str, chunk_service, max_tokens: int, overlap_sentences: int = 0, max_workers: int = 4) -> str:
+        """
+        Polish a long article by splitting it into token-budgeted chunks that are polished concurrently.
+
+        Args:
+            article (str): The article text to polish.
+            chunk_service (ChunkService): Service used to count tokens and split the article.
+            max_tokens (int): Token budget per chunk.
+            overlap_sentences (int): Number of preceding original sentences passed to each chunk as context.
+            max_workers (int): Number of chunks polished in parallel.
+
+        Returns:
+            str: The polished article, reassembled in the original chunk order.
+        """
+        return self.polish_article_chunked_n(article, 1, chunk_service, max_tokens, overlap_sentences, max_workers)[0]
+
+    def polish_article_chunked_n(self, article: str, n: int, chunk_service, max_tokens: int, overlap_sentences: int = 0, max_workers: int = 4) -> list:
+        """
+        Chunked polishing producing `n` versions: every chunk is requested with `n` completions,
+        and version i is reassembled from the i-th completion of each chunk.
+        """
+        if not article:
+            raise ValueError("The article text is empty and cannot be polished.")
+
+        chunks = chunk_service.split_into_chunks(article, max_tokens)
+        if len(chunks) == 1:
+            # Short enough for the regular single-prompt path
+            return self.polish_article_n(article, n)
+
+        prompts = []
+        for idx, (chunk_text, _) in enumerate(chunks):
+            context = chunk_service.tail_context(chunks[idx - 1][0], overlap_sentences) if idx > 0 else ""
+            prompts.append(self.prompt_service.get_chunk_prompt(self.prompt_version, chunk_text, context))
+
+        # executor.map preserves input order, so chunks reassemble in document order
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            polished_chunks = list(executor.map(lambda prompt: self._complete_n(prompt, n), prompts))
+
+        separators = [separator for _, separator in chunks]
+        return [
+            chunk_service.join_chunks([completions[version] for completions in polished_chunks], separators)
+            for version in range(n)
+        ]
@@ -0,0 +1,143 @@
+import os
+import sys
+import time
+import pstats
+import cProfile
+import threading
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+
+
+class StackSampler:
+    """
+    Background thread that periodically samples the call stack of one thread.
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+
+class ProfilingService:
+    """
+    Service to profile the stages of a workflow on demand.
+
+    When enabled, each stage is run under cProfile (deterministic) and a stack
+    sampler, and optionally tracemalloc. Results are written under
+    `<output_dir>/<workflow>/`:
+        <stage>.prof         cProfile stats, loadable with pstats/snakeviz.
+        <stage>.memory.txt   Top allocation sites (with --profile-memory).
+        stacks.collapsed     Sampled stacks in collapsed format for flamegraph.pl/speedscope.
+        hotspots.txt         Per-stage wall time and top-N functions.
+    When disabled, `stage` is a no-op.
+    """
+
+    def __init__(self, workflow: str, enabled: bool = False, memory: bool = False, top_n: int = 20,
+                 sample_interval: float = 0.005, output_dir: str = "results/profiles"):
+        self.workflow = workflow
+        self.enabled = enabled
+        self.memory = memory
+        self.top_n = top_n
+        self.sample_interval = sample_interval
+        self.output_dir = os.path.join(output_dir, workflow)
+        self.stage_times = {}
+        self.stage_stats = {}
+        self.collapsed_stacks = Counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        if not self.enabled:
+            yield
+            return
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        profiler = cProfile.Profile()
+        sampler = StackSampler(threading.get_ident(), self.sample_interval)
+        if self.memory:
+            tracemalloc.start()
+
+        sampler.start()
+        start_time = time.perf_counter()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            self.stage_times[name] = time.perf_counter() - start_time
+            sampler.stop()
+
+            profiler.dump_stats(os.path.join(self.output_dir, f"{name}.prof"))
+            self.stage_stats[name] = pstats.Stats(profiler)
+            for stack, count in sampler.samples.items():
+                self.collapsed_stacks[f"{name};{stack}"] += count
+
+            if self.memory:
+                snapshot = tracemalloc.take_snapshot()
+                current, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                self._write_memory_report(name, snapshot, current, peak)
+
+    def _write_memory_report(self, name, snapshot, current, peak):
+        lines = [f"Stage: {name}", f"Current traced memory: {current / 1024 / 1024:.2f} MiB",
+                 f"Peak traced memory: {peak / 1024 / 1024:.2f} MiB", "", f"Top {self.top_n} allocation sites:"]
+        lines += [str(stat) for stat in snapshot.statistics("lineno")[:self.top_n]]
+        with open(os.path.join(self.output_dir, f"{name}.memory.txt"), "w", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
+
+    def write_summary(self) -> None:
+        """
+        Write the collapsed-stack flamegraph file and the hotspot summary for all profiled stages.
+        """
+        if not self.enabled or not self.stage_stats:
+            return
+
+        with open(os.path.join(self.output_dir, "stacks.collapsed"), "w", encoding="utf-8") as file:
+            for stack, count in sorted(self.collapsed_stacks.items()):
+                file.write(f"{stack} {count}\n")
+
+        with open(os.path.join(self.output_dir, "hotspots.txt"), "w", encoding="utf-8") as file:
+            file.write(f"Workflow: {self.workflow}\n\nStage wall times:\n")
+            for name, seconds in self.stage_times.items():
+                file.write(f"  {name}: {seconds:.3f}s\n")
+            for name, stats in self.stage_stats.items():
+                for sort_key in ("cumulative", "tottime"):
+                    file.write(f"\n===== {name}: top {self.top_n} by {sort_key} =====\n")
+                    stats.stream = file
+                    stats.sort_stats(sort_key).print_stats(self.top_n)
+
+        print(f"Saved profiles for {self.workflow} in {self.output_dir}.")
+
+    @classmethod
+    def from_args(cls, workflow: str, args):
+        return cls(workflow, enabled=args.profile, memory=args.profile_memory, top_n=args.profile_top)
+
+
+def add_profiling_arguments(parser) -> None:
+    """
+    Add the shared --profile options to a workflow's argument parser.
+    """
+    parser.add_argument("--profile", action="store_true", help="Profile each workflow stage and write reports under results/profiles/")
+    parser.add_argument("--profile-memory", action="store_true", help="Also record tracemalloc snapshots per stage (requires --profile)")
+    parser.add_argument("--profile-top", type=int, default=20, help="Number of hotspots listed per stage in the profile summary")
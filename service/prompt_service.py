@@ -16,12 +16,40 @@ Here is the letter:
             # Future versions can be added here
         }
 
+        # Prompts for polishing one section of a longer manuscript; {context} holds the
+        # preceding text so the section reads continuously but is not itself rewritten.
+        self.chunk_prompts = {
+            "v1": """
+Act as a professional writer with extensive expertise in dermatology. 
+Your task is to enhance the readability and flow of one section of a longer manuscript, 
+ensuring it sounds like it was written by a native speaker. 
+While improving the writing style, maintain the original meaning and intent of the text. 
+Return only the polished section, without headings or commentary.
+For continuity, this is the text that immediately precedes the section (do not return it):
+{context}
+Here is the section:
+{text}
+"""
+        }
+
     def get_prompt(self, version: str, text: str) -> str:
         if version not in self.prompts:
             raise ValueError(f"Prompt version '{version}' not found.")
 
         return self.prompts[version].format(text=text)
 
+    def get_template(self, version: str) -> str:
+        if version not in self.prompts:
+            raise ValueError(f"Prompt version '{version}' not found.")
+
+        return self.prompts[version]
+
+    def get_chunk_prompt(self, version: str, text: str, context: str = "") -> str:
+        if version not in self.chunk_prompts:
+            raise ValueError(f"Chunk prompt version '{version}' not found.")
+
+        return self.chunk_prompts[version].format(text=text, context=context or "(start of manuscript)")
+
     def add_prompt(self, version: str, prompt_template: str) -> None:
         self.prompts[version] = prompt_template
 
@@ -0,0 +1,27 @@
+import time
+import threading
+
+
+class RateLimiter:
+    """
+    Thread-safe limiter that spaces API requests evenly under a global requests-per-minute budget.
+    """
+
+    def __init__(self, requests_per_minute: float):
+        if requests_per_minute <= 0:
+            raise ValueError("requests_per_minute must be positive.")
+        self.interval = 60.0 / requests_per_minute
+        self.lock = threading.Lock()
+        self.next_slot = time.monotonic()
+
+    def acquire(self) -> None:
+        """
+        Block until the caller may send its next request.
+        """
+        with self.lock:
+            now = time.monotonic()
+            wait = self.next_slot - now
+            # Reserve the slot before sleeping so concurrent callers queue up behind it
+            self.next_slot = max(self.next_slot, now) + self.interval
+        if wait > 0:
+            time.sleep(wait)
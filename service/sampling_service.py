@@ -0,0 +1,101 @@
+import math
+import random
+from scipy.stats import t as student_t
+
+
+class AdaptiveSampler:
+    """
+    Service for stratified sequential sampling with per-stratum stopping.
+
+    Jobs are drawn at random without replacement within each stratum, in batches.
+    After each batch the running mean and confidence interval of every stratum are
+    updated (Student-t interval with finite population correction); a stratum
+    stops being sampled once its interval is narrower than `target_width` or its
+    population is exhausted.
+
+    Scores are bounded to [0, 1] and often pile up at 0 or 1, where a handful of
+    identical draws has zero sample variance. The variance is therefore floored,
+    Agresti-Coull style, by the variance of the draws plus one pseudo-observation
+    at each bound, so a stratum cannot stop on a spurious zero-width interval.
+    """
+
+    def __init__(self, jobs_by_stratum: dict, target_width: float, confidence: float = 0.95,
+                 batch_size: int = 5, min_samples: int = 5, seed: int = 42):
+        self.target_width = target_width
+        self.batch_size = batch_size
+        self.min_samples = max(min_samples, 2)
+        self.confidence = confidence
+
+        rng = random.Random(seed)
+        self.pending = {}
+        self.population = {}
+        self.values = {}
+        for stratum, jobs in jobs_by_stratum.items():
+            jobs = list(jobs)
+            rng.shuffle(jobs)
+            self.pending[stratum] = jobs
+            self.population[stratum] = len(jobs)
+            self.values[stratum] = []
+
+    def next_batch(self) -> list:
+        """
+        Draw the next batch of (stratum, job) pairs from every stratum that has not converged.
+        """
+        batch = []
+        for stratum, jobs in self.pending.items():
+            if self.is_converged(stratum):
+                continue
+            for _ in range(min(self.batch_size, len(jobs))):
+                batch.append((stratum, jobs.pop()))
+        return batch
+
+    def record(self, stratum, value: float) -> None:
+        self.values[stratum].append(value)
+
+    def discard(self, stratum) -> None:
+        """
+        Drop a drawn job that could not be scored from the stratum's population.
+        """
+        self.population[stratum] -= 1
+
+    @staticmethod
+    def _variance(values: list) -> float:
+        mean = sum(values) / len(values)
+        return sum((value - mean) ** 2 for value in values) / (len(values) - 1)
+
+    def estimate(self, stratum) -> dict:
+        values = self.values[stratum]
+        n, population = len(values), self.population[stratum]
+        mean = sum(values) / n if n else float("nan")
+        if n > 1:
+            std = math.sqrt(self._variance(values))
+            floored_std = math.sqrt(max(std ** 2, self._variance(values + [0.0, 1.0])))
+            fpc = math.sqrt((population - n) / (population - 1)) if population > 1 else 0.0
+            t_quantile = float(student_t.ppf(0.5 + self.confidence / 2, df=n - 1))
+            half_width = t_quantile * floored_std / math.sqrt(n) * fpc
+        else:
+            std = float("nan")
+            half_width = 0.0 if n and n >= population else float("inf")
+
+        # Scores live in [0, 1], so the interval is clipped to that range
+        if n:
+            ci_low, ci_high = max(mean - half_width, 0.0), min(mean + half_width, 1.0)
+            ci_width = ci_high - ci_low
+        else:
+            ci_low = ci_high = float("nan")
+            ci_width = float("inf")
+        return {
+            "n": n,
+            "population": population,
+            "mean": mean,
+            "std": std,
+            "ci_low": ci_low,
+            "ci_high": ci_high,
+            "ci_width": ci_width,
+        }
+
+    def is_converged(self, stratum) -> bool:
+        n = len(self.values[stratum])
+        if not self.pending[stratum] or n >= self.population[stratum]:
+            return True
+        return n >= self.min_samples and self.estimate(stratum)["ci_width"] <= self.target_width
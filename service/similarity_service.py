@@ -0,0 +1,85 @@
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+
+class SimilarityService:
+    """
+    Service to measure how much two versions of an article differ.
+    """
+
+    def __init__(self):
+        self.vectorizer = TfidfVectorizer()
+
+    def fit_transform(self, texts: list):
+        """
+        Fit TF-IDF on the whole corpus and encode every text.
+
+        Args:
+            texts (list): All texts (every version of every article).
+
+        Returns:
+            tuple: (tfidf, binary, token_ids) where `tfidf` is the L2-normalized sparse
+                   TF-IDF matrix, `binary` the sparse token-presence matrix over the same
+                   vocabulary and `token_ids` the token sequence of each text as int arrays.
+        """
+        tfidf = self.vectorizer.fit_transform(texts)
+        binary = (tfidf > 0).astype(np.float64)
+
+        # Reuse the fitted analyzer/vocabulary so edit distance sees the same tokens
+        analyzer = self.vectorizer.build_analyzer()
+        vocabulary = self.vectorizer.vocabulary_
+        token_ids = [
+            np.fromiter((vocabulary[token] for token in analyzer(text)), dtype=np.int32)
+            for text in texts
+        ]
+        return tfidf, binary, token_ids
+
+    @staticmethod
+    def pairwise_cosine(tfidf, rows_a: np.ndarray, rows_b: np.ndarray) -> np.ndarray:
+        """
+        Cosine similarity for many row pairs at once (rows are already L2-normalized).
+        """
+        return np.asarray(tfidf[rows_a].multiply(tfidf[rows_b]).sum(axis=1)).ravel()
+
+    @staticmethod
+    def pairwise_jaccard(binary, rows_a: np.ndarray, rows_b: np.ndarray) -> np.ndarray:
+        """
+        Token-set Jaccard similarity for many row pairs at once.
+        """
+        sizes = np.asarray(binary.sum(axis=1)).ravel()
+        intersection = np.asarray(binary[rows_a].multiply(binary[rows_b]).sum(axis=1)).ravel()
+        union = sizes[rows_a] + sizes[rows_b] - intersection
+        return np.divide(intersection, union, out=np.ones_like(intersection), where=union > 0)
+
+    @staticmethod
+    def edit_distance(tokens_a: np.ndarray, tokens_b: np.ndarray) -> int:
+        """
+        Token-level Levenshtein distance.
+
+        Each row of the dynamic-programming table is computed with numpy: the
+        substitution/deletion terms are elementwise, and the left-to-right insertion
+        dependency is resolved with a running minimum, since
+        row[j] = min over k <= j of (t[k] + j - k).
+        """
+        # Loop over the shorter sequence, vectorize over the longer one
+        if len(tokens_a) > len(tokens_b):
+            tokens_a, tokens_b = tokens_b, tokens_a
+        if len(tokens_a) == 0:
+            return len(tokens_b)
+
+        offsets = np.arange(len(tokens_b) + 1)
+        previous = offsets.copy()
+        current = np.empty_like(previous)
+        for i, token in enumerate(tokens_a, start=1):
+            current[0] = i
+            np.minimum(previous[:-1] + (tokens_b != token), previous[1:] + 1, out=current[1:])
+            previous = np.minimum.accumulate(current - offsets) + offsets
+        return int(previous[-1])
+
+    @classmethod
+    def edit_distance_ratio(cls, tokens_a: np.ndarray, tokens_b: np.ndarray) -> float:
+        """
+        Edit distance divided by the longer length (0 = identical, 1 = entirely rewritten).
+        """
+        longest = max(len(tokens_a), len(tokens_b))
+        return cls.edit_distance(tokens_a, tokens_b) / longest if longest else 0.0
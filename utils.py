@@ -9,9 +9,9 @@ def load_excel(file_path, sheet_name=None):
     except Exception as e:
         raise Exception(f"Failed to load excel file at {file_path}: {e}")
 
-def save_to_txt(file_path, content):
+def save_to_txt(file_path, content, newline=None):
     try:
-        with open(file_path, "w", encoding="utf-8") as file:
+        with open(file_path, "w", encoding="utf-8", newline=newline) as file:
             file.write(content)
     except Exception as e:
         raise Exception(f"Failed to save file to {file_path}: {e}")
@@ -32,6 +32,25 @@ def load_json(file_path):
     except json.JSONDecodeError:
         raise ValueError(f"Metadata file at {file_path} is not a valid JSON file.")
 
+def load_article_text(article_id, rep, data_dir="data", polished_dir="outputs/polished_articles", corpus_store=None, newline=None):
+    """
+    Load the text of one article version from a packed CorpusStore if given, else from the text-file layout.
+    Returns None if the version does not exist. Pass newline="" to keep line endings exactly as stored.
+    """
+    if corpus_store is not None:
+        return corpus_store.get_text(rep, article_id) if corpus_store.has(rep, article_id) else None
+
+    if rep == "original":
+        text_path = os.path.join(data_dir, f"article_{int(article_id):03}.txt")
+    else:
+        text_path = os.path.join(polished_dir, rep, f"output_{int(article_id):03}.txt")
+
+    try:
+        with open(text_path, "r", encoding="utf-8", newline=newline) as file:
+            return file.read()
+    except FileNotFoundError:
+        return None
+
 def load_csv(file_path):
     try:
         return pd.read_csv(file_path)